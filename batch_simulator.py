@@ -0,0 +1,238 @@
+import logging
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from figures_templates import shapes
+from game_core import Action
+from settings import SPEED_LEVELS
+
+logger = logging.getLogger(__name__)
+
+# Runs N independent games at once. Boards are stored as packed rows, one
+# uint64 bitmask per row (bit x is cell [y][x]), in a (N, y_size) array, and
+# every rule of GameCore is applied to the whole batch with array operations.
+#
+# One step() = the action of every board followed by one game tick.
+# A figure locks at its current position, rows above the top (y < 0) are
+# empty, exactly as in Field.
+
+GAME_OVER_NONE = 0
+GAME_OVER_FIELD_FILLED = 1
+GAME_OVER_SPEED_CAP = 2
+
+MAX_SHAPE_SIZE = max(max(shape.x_size, shape.y_size) for shape in shapes)
+
+
+class BatchSimulator:
+    def __init__(
+            self,
+            boards_count: int,
+            field_v_size: int = 20,
+            field_h_size: int = 10,
+            speed_levels: List[int] = None,
+            seed: Optional[int] = None,
+    ):
+        if field_h_size > 63:
+            raise ValueError('Packed rows support fields up to 63 cells wide')
+        self.boards_count = boards_count
+        self.y_size = field_v_size
+        self.x_size = field_h_size
+        self.full_row_mask = np.uint64((1 << field_h_size) - 1)
+        self.speed_levels = np.array(
+            speed_levels or SPEED_LEVELS, dtype=np.int64,
+        )
+        self.rng: np.random.Generator = np.random.default_rng(seed)
+
+        # shape tables, padded to MAX_SHAPE_SIZE rows
+        self.shape_masks = np.zeros(
+            (len(shapes), MAX_SHAPE_SIZE), dtype=np.uint64,
+        )
+        for shape in shapes:
+            self.shape_masks[shape.id, :shape.y_size] = shape.row_masks
+        self.shape_widths = np.array([s.x_size for s in shapes], np.int64)
+        self.shape_heights = np.array([s.y_size for s in shapes], np.int64)
+        self.next_shape = np.array([s.next_id for s in shapes], np.int64)
+
+        n: int = boards_count
+        self.boards = np.zeros((n, field_v_size), dtype=np.uint64)
+        self.figure_id = np.zeros(n, dtype=np.int64)
+        self.pos_x = np.zeros(n, dtype=np.int64)
+        self.pos_y = np.zeros(n, dtype=np.int64)
+        self.frame_counter = np.zeros(n, dtype=np.int64)
+        self.figure_moves_counter = np.zeros(n, dtype=np.int64)
+        self.move_down_immediately = np.zeros(n, dtype=bool)
+        self.speed_level = np.ones(n, dtype=np.int64)
+        self.points = np.zeros(n, dtype=np.int64)
+        self.pieces = np.zeros(n, dtype=np.int64)
+        self.ticks = np.zeros(n, dtype=np.int64)
+        self.game_over_reason = np.full(n, GAME_OVER_NONE, dtype=np.int8)
+
+        self.__spawn(np.arange(n))
+
+    @property
+    def game_over(self) -> np.ndarray:
+        return self.game_over_reason != GAME_OVER_NONE
+
+    def collides(
+            self,
+            boards: np.ndarray,
+            figure_id: np.ndarray,
+            pos_x: np.ndarray,
+            pos_y: np.ndarray,
+    ) -> np.ndarray:
+        # border collisions
+        result: np.ndarray = (
+            (pos_x < 0)
+            | (pos_x + self.shape_widths[figure_id] > self.x_size)
+            | (pos_y + self.shape_heights[figure_id] > self.y_size)
+        )
+        # collisions with frozen cells, masks are shifted into place
+        masks: np.ndarray = self.shape_masks[figure_id]
+        rows_index: np.ndarray = pos_y[:, None] + np.arange(MAX_SHAPE_SIZE)
+        in_field: np.ndarray = (rows_index >= 0) & (rows_index < self.y_size)
+        rows: np.ndarray = self.boards[
+            boards[:, None], np.clip(rows_index, 0, self.y_size - 1),
+        ]
+        shifted: np.ndarray = masks << np.clip(pos_x, 0, 63).astype(
+            np.uint64,
+        )[:, None]
+        result |= (((rows & shifted) != 0) & in_field).any(axis=1)
+        return result
+
+    # returns the boards whose figure was locked by this step
+    def step(self, actions: np.ndarray) -> np.ndarray:
+        active: np.ndarray = np.flatnonzero(~self.game_over)
+        board_actions: np.ndarray = np.asarray(actions)[active]
+
+        for shift, action in ((-1, Action.LEFT), (1, Action.RIGHT)):
+            boards = active[board_actions == action.value]
+            new_x = self.pos_x[boards] + shift
+            allowed = ~self.collides(
+                boards, self.figure_id[boards], new_x, self.pos_y[boards],
+            )
+            self.pos_x[boards[allowed]] = new_x[allowed]
+
+        boards = active[board_actions == Action.ROTATE.value]
+        new_id = self.next_shape[self.figure_id[boards]]
+        allowed = ~self.collides(
+            boards, new_id, self.pos_x[boards], self.pos_y[boards],
+        )
+        self.figure_id[boards[allowed]] = new_id[allowed]
+
+        boards = active[board_actions == Action.SOFT_DROP.value]
+        self.move_down_immediately[boards] = True
+
+        return self.__tick(active)
+
+    def __tick(self, active: np.ndarray) -> np.ndarray:
+        self.ticks[active] += 1
+        waiting: np.ndarray = (
+            self.frame_counter[active]
+            < self.speed_levels[self.speed_level[active] - 1]
+        ) & ~self.move_down_immediately[active]
+        self.frame_counter[active[waiting]] += 1
+
+        falling: np.ndarray = active[~waiting]
+        self.frame_counter[falling] = 0
+        blocked: np.ndarray = self.collides(
+            falling,
+            self.figure_id[falling],
+            self.pos_x[falling],
+            self.pos_y[falling] + 1,
+        )
+        moving: np.ndarray = falling[~blocked]
+        self.pos_y[moving] += 1
+        self.figure_moves_counter[moving] += 1
+
+        locked: np.ndarray = falling[blocked]
+        cleared: np.ndarray = self.__lock(locked)
+        self.points[locked] += cleared
+        scored: np.ndarray = locked[self.points[locked] >= 10]
+        self.speed_level[scored] = self.points[scored] // 10 + 1
+
+        speed_cap: np.ndarray = (
+            self.speed_level[falling] == len(self.speed_levels) - 1
+        )
+        self.game_over_reason[falling[speed_cap]] = GAME_OVER_SPEED_CAP
+
+        playing: np.ndarray = locked[
+            self.game_over_reason[locked] == GAME_OVER_NONE
+        ]
+        filled: np.ndarray = (
+            self.figure_moves_counter[playing] == 0
+        ) & self.__is_almost_filled(playing)
+        self.game_over_reason[playing[filled]] = GAME_OVER_FIELD_FILLED
+        self.__spawn(playing[~filled])
+        return locked
+
+    def __lock(self, boards: np.ndarray) -> np.ndarray:
+        masks: np.ndarray = self.shape_masks[self.figure_id[boards]]
+        shift: np.ndarray = self.pos_x[boards].astype(np.uint64)
+        for fig_y in range(MAX_SHAPE_SIZE):
+            rows_index = self.pos_y[boards] + fig_y
+            visible = (rows_index >= 0) & (masks[:, fig_y] != 0)
+            self.boards[boards[visible], rows_index[visible]] |= (
+                masks[visible, fig_y] << shift[visible]
+            )
+
+        # full rows are moved to the top by a stable sort and then emptied
+        rows: np.ndarray = self.boards[boards]
+        full: np.ndarray = rows == self.full_row_mask
+        cleared: np.ndarray = full.sum(axis=1)
+        order: np.ndarray = np.argsort(~full, axis=1, kind='stable')
+        rows = np.take_along_axis(rows, order, axis=1)
+        rows[np.arange(self.y_size) < cleared[:, None]] = 0
+        self.boards[boards] = rows
+        return cleared
+
+    def __is_almost_filled(self, boards: np.ndarray) -> np.ndarray:
+        second_row: np.ndarray = self.boards[boards, 1]
+        filled_cells: np.ndarray = np.unpackbits(
+            second_row.view(np.uint8).reshape(-1, 8), axis=1,
+        ).sum(axis=1)
+        return filled_cells > self.x_size / 2
+
+    def __spawn(self, boards: np.ndarray):
+        figure_id: np.ndarray = self.rng.integers(
+            0, len(shapes), size=len(boards),
+        )
+        self.figure_id[boards] = figure_id
+        self.pos_x[boards] = self.rng.integers(
+            0, self.x_size - self.shape_widths[figure_id] + 1,
+        )
+        self.pos_y[boards] = -1
+        self.figure_moves_counter[boards] = 0
+        self.move_down_immediately[boards] = False
+        self.pieces[boards] += 1
+
+    def run(
+            self,
+            policy: Callable[['BatchSimulator'], np.ndarray],
+            max_steps: int,
+    ) -> Dict[str, np.ndarray]:
+        for _ in range(max_steps):
+            if self.game_over.all():
+                break
+            self.step(policy(self))
+        return self.results()
+
+    def results(self) -> Dict[str, np.ndarray]:
+        return {
+            'points': self.points.copy(),
+            'pieces': self.pieces.copy(),
+            'ticks': self.ticks.copy(),
+            'speed_level': self.speed_level.copy(),
+            'game_over_reason': self.game_over_reason.copy(),
+        }
+
+
+def random_policy(
+        rng: np.random.Generator,
+) -> Callable[[BatchSimulator], np.ndarray]:
+    actions_count: int = len(Action)
+
+    def policy(simulator: BatchSimulator) -> np.ndarray:
+        return rng.integers(0, actions_count, size=simulator.boards_count)
+
+    return policy
@@ -0,0 +1,83 @@
+import argparse
+import random
+import time
+from typing import Callable, Dict
+
+from benchmarks.legacy_field import ListField
+from field import Field
+from figuresfactory import FiguresFactory
+
+# Replays the same seeded game workload on the bitboard Field and on the
+# reference list-of-lists engine:
+#
+#   python -m benchmarks.field_benchmark --pieces 2000 --height 20 --width 10
+
+
+def play_pieces(
+        field_cls: Callable, pieces: int, seed: int, y_size: int, x_size: int,
+) -> int:
+    random.seed(seed)
+    field = field_cls(y_size, x_size)
+    figures_factory = FiguresFactory(x_size, random.Random(seed))
+    ticks: int = 0
+    for _ in range(pieces):
+        figure = figures_factory.get_figure()
+        stop_moving: bool = False
+        just_rotated: bool = False
+        while not stop_moving:
+            action: int = random.randint(0, 3)
+            if action == 0:
+                field.try_to_move_horizontally(figure, -1)
+            elif action == 1:
+                field.try_to_move_horizontally(figure, 1)
+            elif action == 2:
+                just_rotated = field.try_to_rotate_figure(figure)
+            is_bottom_intersection, redraw_rotation = (
+                field.try_to_move_vertically(figure, 1, just_rotated)
+            )
+            stop_moving, _ = field.overlay(
+                figure, is_bottom_intersection, redraw_rotation,
+            )
+            ticks += 1
+        if field.is_almost_filled():
+            field = field_cls(y_size, x_size)
+    return ticks
+
+
+def measure(
+        field_cls: Callable, pieces: int, seed: int, y_size: int, x_size: int,
+) -> Dict:
+    started: float = time.perf_counter()
+    ticks: int = play_pieces(field_cls, pieces, seed, y_size, x_size)
+    elapsed: float = time.perf_counter() - started
+    return {
+        'engine': field_cls.__name__,
+        'ticks': ticks,
+        'seconds': elapsed,
+        'ticks_per_second': ticks / elapsed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Field engine benchmark')
+    parser.add_argument('--pieces', type=int, default=2000)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--height', type=int, default=20)
+    parser.add_argument('--width', type=int, default=10)
+    args = parser.parse_args()
+
+    legacy = measure(
+        ListField, args.pieces, args.seed, args.height, args.width,
+    )
+    bitboard = measure(Field, args.pieces, args.seed, args.height, args.width)
+    for result in (legacy, bitboard):
+        print(
+            f'{result["engine"]:>10}: {result["ticks"]} ticks in '
+            f'{result["seconds"]:.3f}s '
+            f'({result["ticks_per_second"]:.0f} ticks/s)',
+        )
+    print(f'speedup: {legacy["seconds"] / bitboard["seconds"]:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,400 @@
+import argparse
+import contextlib
+import json
+import os
+import platform
+import random
+import re
+import sys
+import tempfile
+import time
+from typing import (
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+
+# headless: must be set before pygame creates the display
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame  # noqa: E402
+
+from benchmarks.field_benchmark import play_pieces  # noqa: E402
+from field import Field  # noqa: E402
+from figure import Figure  # noqa: E402
+from figuresfactory import BagGenerator, FiguresFactory  # noqa: E402
+from game_core import Action, GameCore  # noqa: E402
+from game_level import GameLevel  # noqa: E402
+from images.background import Background  # noqa: E402
+from images.clock import ClockFace  # noqa: E402
+from replay import Replay, ReplayPlayer  # noqa: E402
+from scores.scores import CSVReader, Scores  # noqa: E402
+from settings import (  # noqa: E402
+    BACKGROUND_SOURCE,
+    LEADERBOARD_SIZE,
+    SCREEN_RESOLUTION,
+)
+from tournament import BOT_ACTIONS, new_bot_rng  # noqa: E402
+
+# Performance regression suite, run from the repository root:
+#
+#   python -m benchmarks.suite --save benchmarks/baseline.json
+#   python -m benchmarks.suite --compare benchmarks/baseline.json
+#
+# Every benchmark reports the best time per operation of several runs. A
+# comparison fails (exit code 1) when a benchmark is slower than the baseline
+# by more than its threshold.
+
+SMALL_BOARD = (20, 10)
+LARGE_BOARD = (200, 60)
+HUGE_BOARD = (2000, 1000)
+DEFAULT_THRESHOLD = 0.25
+
+
+class Benchmark(NamedTuple):
+    name: str
+    # generator function: sets up, yields a run() callable returning the
+    # number of operations it made, then cleans up
+    setup: Callable[[], Iterator[Callable[[], int]]]
+    repeat: int
+    threshold: float
+
+
+BENCHMARKS: List[Benchmark] = []
+
+
+def benchmark(
+        name: str, repeat: int = 5, threshold: float = DEFAULT_THRESHOLD,
+) -> Callable:
+    def register(setup: Callable) -> Callable:
+        BENCHMARKS.append(
+            Benchmark(name, contextlib.contextmanager(setup), repeat, threshold),
+        )
+        return setup
+    return register
+
+
+def new_figure(field: Field, figure_id: int = 0) -> Figure:
+    figures_factory: FiguresFactory = FiguresFactory(
+        field.x_size, random.Random(0),
+    )
+    figure: Figure = figures_factory.get_specific_figure(figure_id)
+    figure.current_pos = [field.x_size // 2, field.y_size // 2]
+    return figure
+
+
+for board_name, (y_size, x_size), game_pieces in (
+        ('small', SMALL_BOARD, 1000),
+        ('large', LARGE_BOARD, 1000),
+        ('huge', HUGE_BOARD, 20),
+):
+    @benchmark(f'field.move.{board_name}')
+    def field_move(y_size: int = y_size, x_size: int = x_size):
+        field: Field = Field(y_size, x_size)
+        figure = new_figure(field)
+
+        def run() -> int:
+            for _ in range(5000):
+                field.try_to_move_horizontally(figure, -1)
+                field.try_to_move_horizontally(figure, 1)
+            return 10000
+        yield run
+
+    @benchmark(f'field.rotate.{board_name}')
+    def field_rotate(y_size: int = y_size, x_size: int = x_size):
+        field: Field = Field(y_size, x_size)
+        figure = new_figure(field, figure_id=2)
+
+        def run() -> int:
+            for _ in range(10000):
+                field.try_to_rotate_figure(figure)
+            return 10000
+        yield run
+
+    @benchmark(f'field.overlay.{board_name}')
+    def field_overlay(y_size: int = y_size, x_size: int = x_size):
+        field: Field = Field(y_size, x_size)
+        figure = new_figure(field)
+        start_y: int = figure.current_pos[1]
+
+        def run() -> int:
+            for step in range(10000):
+                figure.current_pos[1] = start_y + step % 2
+                field.overlay(figure, False, False)
+            field.pop_dirty_cells()
+            return 10000
+        yield run
+
+    @benchmark(f'field.clear_rows.{board_name}')
+    def field_clear_rows(y_size: int = y_size, x_size: int = x_size):
+        field: Field = Field(y_size, x_size)
+        bottom_rows: range = range(y_size - 4, y_size)
+
+        def run() -> int:
+            for _ in range(2000):
+                # four full rows, as after an I figure locks
+                for y_pos in bottom_rows:
+                    field.current_rows[y_pos] = field.full_row_mask
+                    field.stable_rows[y_pos] = field.full_row_mask
+                field.delete_rows_if_necessary(bottom_rows)
+            field.pop_dirty_cells()
+            return 2000
+        yield run
+
+    @benchmark(f'field.game.{board_name}')
+    def field_game(
+            y_size: int = y_size, x_size: int = x_size, pieces: int = game_pieces,
+    ):
+        # moves, rotations, overlays and row clears of seeded random play
+        yield lambda: play_pieces(Field, pieces, 1, y_size, x_size)
+
+
+@benchmark('factory.get_figure')
+def factory_get_figure():
+    figures_factory: FiguresFactory = FiguresFactory(10, random.Random(0))
+
+    def run() -> int:
+        for _ in range(10000):
+            figures_factory.get_figure()
+        return 10000
+    yield run
+
+
+@benchmark('factory.bag_take')
+def factory_bag_take():
+    figures_factory: FiguresFactory = FiguresFactory(
+        10, random.Random(0), generator=BagGenerator(),
+    )
+    yield lambda: len(figures_factory.take(10000)[0])
+
+
+@benchmark('game.replay')
+def game_replay():
+    # fixed workload: a recorded game of the self-play bot, fast-forwarded
+    replay: Replay = Replay(seed=1)
+    core: GameCore = replay.new_core()
+    bot_rng: random.Random = new_bot_rng(1)
+    while not core.game_over and core.ticks < 20000:
+        action: Action = bot_rng.choice(BOT_ACTIONS)
+        if action != Action.TICK:
+            replay.record(core.ticks, action)
+            core.step(action)
+        core.step(Action.TICK)
+    replay.finish(core.ticks)
+
+    def run() -> int:
+        return sum(ReplayPlayer(replay).run().ticks for _ in range(20))
+    yield run
+
+
+@contextlib.contextmanager
+def game_level(
+        field_size: Tuple[int, int] = SMALL_BOARD,
+) -> Iterator[GameLevel]:
+    level: GameLevel = GameLevel(
+        current_user='benchmark',
+        scores=None,
+        field_v_size=field_size[0],
+        field_h_size=field_size[1],
+    )
+    level.start_screen_active = False
+    try:
+        yield level
+    finally:
+        level.background_images.close()
+
+
+for board_name, board_size in (('small', SMALL_BOARD), ('huge', HUGE_BOARD)):
+    @benchmark(f'render.full_frame.{board_name}', threshold=0.5)
+    def render_full_frame(board_size: Tuple[int, int] = board_size):
+        with game_level(board_size) as level:
+            # every other cell filled, only the visible part is drawn
+            for y_pos in range(board_size[0]):
+                level.field.current_rows[y_pos] = (
+                    level.field.full_row_mask // 3
+                )
+
+            def run() -> int:
+                for _ in range(50):
+                    level.need_full_redraw = True
+                    level.draw_field()
+                return 50
+            yield run
+
+
+@benchmark('render.figure_moved', threshold=0.5)
+def render_figure_moved():
+    # the usual frame: only the cells of the moved figure are redrawn
+    with game_level() as level:
+        figure: Figure = level.core.current_figure
+        figure.current_pos = [3, 5]
+        level.draw_field()
+
+        def run() -> int:
+            for step in range(200):
+                figure.current_pos[0] = 3 + step % 2
+                level.field.overlay(figure, False, False)
+                level.draw_field()
+            return 200
+        yield run
+
+
+@benchmark('startup.game_level', repeat=3, threshold=0.5)
+def startup_game_level():
+    def run() -> int:
+        with game_level():
+            pass
+        return 1
+    yield run
+
+
+@benchmark('startup.assets', repeat=3, threshold=0.5)
+def startup_assets():
+    pygame.display.init()
+    pygame.display.set_mode(SCREEN_RESOLUTION)
+
+    def run() -> int:
+        background: Background = Background(BACKGROUND_SOURCE)
+        next(background)
+        background.close()
+        ClockFace('digits')
+        return 1
+    yield run
+
+
+def write_scores(root_dir: str, count: int):
+    rng: random.Random = random.Random(count)
+    with open(os.path.join(root_dir, 'scores.dat'), 'w') as scores_file:
+        for number in range(count):
+            scores_file.write(
+                f'{rng.randint(0, 500)},user{rng.randint(0, 999)},'
+                f'2020-01-07T00:00:00,session{number}\n',
+            )
+
+
+def load_and_sort_scores(root_dir: str) -> int:
+    scores: Scores = Scores(CSVReader(root_dir))
+    scores.scores_table.get_top(LEADERBOARD_SIZE)
+    records: List = sorted(scores.scores_table.get_scores(), reverse=True)
+    return len(records)
+
+
+for rows_name, rows_count, rows_repeat in (
+        ('10k', 10000, 5), ('1m', 1000000, 1),
+):
+    @benchmark(f'scores.load_sort.{rows_name}', repeat=rows_repeat)
+    def scores_load_sort(rows_count: int = rows_count):
+        with tempfile.TemporaryDirectory() as root_dir:
+            write_scores(root_dir, rows_count)
+            yield lambda: load_and_sort_scores(root_dir)
+
+
+def measure(bench: Benchmark) -> Dict:
+    with bench.setup() as run:
+        best: Optional[float] = None
+        operations: int = 0
+        for _ in range(bench.repeat):
+            started: float = time.perf_counter()
+            operations = run()
+            elapsed: float = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+    return {
+        'seconds': best,
+        'operations': operations,
+        'seconds_per_operation': best / operations,
+        'threshold': bench.threshold,
+    }
+
+
+def run_benchmarks(name_filter: str = '') -> Dict[str, Dict]:
+    results: Dict[str, Dict] = {}
+    for bench in BENCHMARKS:
+        if re.search(name_filter, bench.name):
+            results[bench.name] = measure(bench)
+            print(format_result(bench.name, results[bench.name]))
+    return results
+
+
+def format_result(name: str, result: Dict) -> str:
+    per_operation: float = result['seconds_per_operation']
+    return (
+        f'{name:<28} {per_operation * 1e6:12.2f} us/op'
+        f' ({result["operations"]} ops in {result["seconds"]:.3f}s)'
+    )
+
+
+def compare(
+        results: Dict[str, Dict],
+        baseline: Dict[str, Dict],
+        threshold: Optional[float] = None,
+) -> List[str]:
+    # returns the names of benchmarks slower than allowed
+    regressions: List[str] = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        allowed: float = (
+            threshold if threshold is not None else result['threshold']
+        )
+        ratio: float = (
+            result['seconds_per_operation']
+            / baseline[name]['seconds_per_operation']
+        )
+        status: str = 'ok'
+        if ratio > 1 + allowed:
+            status = 'REGRESSION'
+            regressions.append(name)
+        print(
+            f'{name:<28} {ratio:6.2f}x baseline'
+            f' (limit {1 + allowed:.2f}x) {status}',
+        )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Performance benchmarks')
+    parser.add_argument(
+        '--filter', default='', help='regular expression for benchmark names',
+    )
+    parser.add_argument('--save', help='write the results as a JSON baseline')
+    parser.add_argument('--compare', help='JSON baseline to compare against')
+    parser.add_argument(
+        '--threshold',
+        type=float,
+        default=None,
+        help='allowed slowdown for every benchmark, 0.25 means 25%%',
+    )
+    parser.add_argument('--list', action='store_true')
+    args = parser.parse_args()
+
+    if args.list:
+        for bench in BENCHMARKS:
+            print(bench.name)
+        return
+
+    results: Dict[str, Dict] = run_benchmarks(args.filter)
+    if args.save:
+        with open(args.save, 'w') as baseline_file:
+            json.dump(
+                {
+                    'python': platform.python_version(),
+                    'platform': platform.platform(),
+                    'results': results,
+                },
+                baseline_file,
+                indent=4,
+            )
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            baseline: Dict = json.load(baseline_file)
+        if compare(results, baseline['results'], args.threshold):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
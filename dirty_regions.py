@@ -0,0 +1,27 @@
+from typing import List
+
+import pygame
+
+
+class DirtyRegions:
+    # collects screen areas changed during a frame, so only those areas are
+    # sent to the display instead of the whole screen
+    def __init__(self):
+        self.rects: List[pygame.Rect] = []
+        self.full_screen: bool = False
+
+    def add(self, rect: pygame.Rect):
+        if not self.full_screen:
+            self.rects.append(rect)
+
+    def invalidate(self):
+        self.full_screen = True
+        self.rects = []
+
+    def flush(self):
+        if self.full_screen:
+            pygame.display.update()
+        elif self.rects:
+            pygame.display.update(self.rects)
+        self.rects = []
+        self.full_screen = False
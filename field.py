@@ -1,8 +1,7 @@
 import logging
-from typing import Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
 from figure import Figure
-from copy import deepcopy
-from figures_templates import get_id_next_figure
+from figures_templates import Shape, get_id_next_figure, shapes
 
 logger = logging.getLogger(__name__)
 
@@ -17,22 +16,73 @@ logger = logging.getLogger(__name__)
 # Y           BOTTOM (final position)
 #
 # Field indexing: [y][x]
+#
+# Every row is stored as an int bitmask: bit x is set when cell [y][x] is
+# filled. Rows above the top (y < 0) are always empty.
+
+
+class FrameView:
+    # read-only [y][x] view over bitmask rows, used by the renderer
+    def __init__(self, rows: List[int], x_size: int):
+        self.__rows = rows
+        self.__x_size = x_size
+
+    def __len__(self) -> int:
+        return len(self.__rows)
+
+    def __getitem__(self, y: int) -> List[int]:
+        row: int = self.__rows[y]
+        return [(row >> x) & 1 for x in range(self.__x_size)]
+
+    def __iter__(self) -> Iterator[List[int]]:
+        for y in range(len(self.__rows)):
+            yield self[y]
 
 
 class Field:
     def __init__(self, y_size: int, x_size: int):
         self.x_size = x_size
         self.y_size = y_size
+        self.full_row_mask: int = (1 << x_size) - 1
 
         # current changeable frame = stable_frame + current figure
-        self.current_frame = [
-            [0 for _ in range(x_size)] for _ in range(y_size)
-        ]
+        self.current_rows: List[int] = [0] * y_size
 
         # frame without moving figure, only frozen
-        self.__stable_frame = [
-            [0 for _ in range(x_size)] for _ in range(y_size)
-        ]
+        self.__stable_rows: List[int] = [0] * y_size
+
+        # (row_masks, x, y) of the figure currently drawn into current_rows
+        self.__drawn_figure: Optional[Tuple[Tuple[int, ...], int, int]] = None
+
+        # (x, y) cells of current_frame changed since the last pop
+        self.dirty_cells: Set[Tuple[int, int]] = set()
+        # rows 0..shifted_rows - 1 moved down since the last pop; their
+        # cells are not listed in dirty_cells
+        self.shifted_rows: int = 0
+
+    @property
+    def current_frame(self) -> FrameView:
+        return FrameView(self.current_rows, self.x_size)
+
+    @property
+    def stable_rows(self) -> List[int]:
+        # frozen cells only, must not be modified by callers
+        return self.__stable_rows
+
+    def fits(self, shape: Shape, pos_x: int, pos_y: int) -> bool:
+        return not self.__has_field_collision(
+            shape, pos_x, pos_y,
+        ) and not self.__has_stable_collision(shape.row_masks, pos_x, pos_y)
+
+    def pop_dirty_cells(self) -> Set[Tuple[int, int]]:
+        dirty_cells: Set[Tuple[int, int]] = self.dirty_cells
+        self.dirty_cells = set()
+        return dirty_cells
+
+    def pop_shifted_rows(self) -> int:
+        shifted_rows: int = self.shifted_rows
+        self.shifted_rows = 0
+        return shifted_rows
 
     def try_to_move_horizontally(self, figure: Figure, shift: int):
         possible_position_x: int = figure.current_pos[0] + shift
@@ -44,13 +94,10 @@ class Field:
         if possible_position_x < 0:
             return
 
-        for fig_y in range(figure.y_size):
-            for fig_x in range(figure.x_size):
-                if figure.area[fig_y][fig_x] == 1:  # check only active cells
-                    y_pos = fig_y + figure.current_pos[1]
-                    x_pos = fig_x + possible_position_x
-                    if self.__stable_frame[y_pos][x_pos] == 1:
-                        return
+        if self.__has_stable_collision(
+                figure.row_masks, possible_position_x, figure.current_pos[1],
+        ):
+            return
 
         figure.current_pos[0] += shift
 
@@ -83,13 +130,13 @@ class Field:
         logger.debug(
             'Trying to transform (%d)->(%d)', cur_figure_id, next_figure_id,
         )
-        figure.transform(next_figure_id)
-        if self.__has_field_collision(figure) or self.__prev_figures_collision(
-                figure,
-        ):
+        # the candidate rotation is tested against the shared shape, the
+        # figure itself is only touched once the rotation is possible
+        pos_x, pos_y = figure.current_pos
+        if not self.fits(shapes[next_figure_id], pos_x, pos_y):
             logger.debug('Keep figure (%d)', cur_figure_id)
-            figure.transform(cur_figure_id)  # return prev figure
             return False
+        figure.transform(next_figure_id)
         return True
 
     def __is_intersection_with_bottom(
@@ -109,35 +156,40 @@ class Field:
     ) -> bool:
         if possible_position_y is None:
             possible_position_y = figure.current_pos[1]
-        for fig_y in range(figure.y_size):
-            for fig_x in range(figure.x_size):
-                if (
-                        figure.area[fig_y][fig_x] == 1
-                ):  # filled cell of figures area
-                    x_pos = fig_x + figure.current_pos[0]
-                    y_pos = fig_y + possible_position_y
-                    if (
-                            self.__stable_frame[y_pos][x_pos] == 1
-                    ):  # ...cell in frame was filled too
-                        logger.debug(
-                            'Collision with other figures on x=%d, y=%d',
-                            x_pos,
-                            y_pos,
-                        )
-                        return True
+        if self.__has_stable_collision(
+                figure.row_masks, figure.current_pos[0], possible_position_y,
+        ):
+            logger.debug(
+                'Figure at x=%d, y=%d collides with other figures',
+                figure.current_pos[0],
+                possible_position_y,
+            )
+            return True
         return False
 
-    def __has_field_collision(self, figure: Figure) -> bool:
+    def __has_stable_collision(
+            self, row_masks: Tuple[int, ...], pos_x: int, pos_y: int,
+    ) -> bool:
+        stable_rows: List[int] = self.__stable_rows
+        for fig_y, mask in enumerate(row_masks):
+            y_pos: int = pos_y + fig_y
+            if y_pos >= 0 and stable_rows[y_pos] & (mask << pos_x):
+                return True
+        return False
+
+    def __has_field_collision(
+            self, shape: Shape, pos_x: int, pos_y: int,
+    ) -> bool:
         # right border collision
-        if figure.current_pos[0] + figure.x_size > self.x_size:
+        if pos_x + shape.x_size > self.x_size:
             return True
 
         # left border collision
-        if figure.current_pos[0] < 0:
+        if pos_x < 0:
             return True
 
         # bottom collision
-        if figure.current_pos[1] + figure.y_size > self.y_size:
+        if pos_y + shape.y_size > self.y_size:
             return True
 
         return False
@@ -152,41 +204,85 @@ class Field:
             if redraw_rotation:
                 logger.debug('Need to redraw current_frame due to rotation!')
                 self.__redraw_current_frame(figure)
-            points: int = self.delete_rows_if_necessary()
-            self.__stable_frame = deepcopy(self.current_frame)
+            points: int = self.__freeze_drawn_figure()
             return True, points
 
         self.__redraw_current_frame(figure)
         return False, 0
 
     def __redraw_current_frame(self, figure: Figure):
-        new_field = deepcopy(self.__stable_frame)
-        for i in range(figure.x_size):
-            for j in range(figure.y_size):
-                if figure.area[j][i] == 1:
-                    x_pos = i + figure.current_pos[0]
-                    y_pos = j + figure.current_pos[1]
-                    new_field[y_pos][x_pos] = figure.area[j][i]
-        self.current_frame = deepcopy(new_field)
-
-    def delete_rows_if_necessary(self) -> int:
-        rows_to_delete = [
-            i
-            for i in range(self.y_size)
-            if sum(self.current_frame[i]) == self.x_size
+        # only rows under the previous and the new figure position change:
+        # xor-ing both masks erases the old cells and draws the new ones
+        rows_changes: Dict[int, int] = {}
+        if self.__drawn_figure is not None:
+            self.__add_figure_changes(rows_changes, *self.__drawn_figure)
+        pos_x, pos_y = figure.current_pos
+        self.__add_figure_changes(rows_changes, figure.row_masks, pos_x, pos_y)
+        self.__drawn_figure = (figure.row_masks, pos_x, pos_y)
+
+        current_rows: List[int] = self.current_rows
+        for y_pos, change in rows_changes.items():
+            current_rows[y_pos] ^= change
+            self.__mark_dirty(y_pos, change)
+
+    @staticmethod
+    def __add_figure_changes(
+            rows_changes: Dict[int, int],
+            row_masks: Tuple[int, ...],
+            pos_x: int,
+            pos_y: int,
+    ):
+        for fig_y, mask in enumerate(row_masks):
+            y_pos: int = pos_y + fig_y
+            if y_pos >= 0:
+                rows_changes[y_pos] = rows_changes.get(y_pos, 0) ^ (
+                    mask << pos_x
+                )
+
+    def __mark_dirty(self, y_pos: int, change: int):
+        while change:
+            lowest_bit: int = change & -change
+            self.dirty_cells.add((lowest_bit.bit_length() - 1, y_pos))
+            change ^= lowest_bit
+
+    def __freeze_drawn_figure(self) -> int:
+        if self.__drawn_figure is None:
+            return 0
+        row_masks, _, pos_y = self.__drawn_figure
+        self.__drawn_figure = None
+
+        figure_rows: range = range(
+            max(pos_y, 0), pos_y + len(row_masks),
+        )
+        for y_pos in figure_rows:
+            self.__stable_rows[y_pos] = self.current_rows[y_pos]
+        # only rows covered by the frozen figure can become full
+        return self.delete_rows_if_necessary(figure_rows)
+
+    def delete_rows_if_necessary(self, rows: Iterable[int] = None) -> int:
+        if rows is None:
+            rows = range(self.y_size)
+        full_row_mask: int = self.full_row_mask
+        current_rows: List[int] = self.current_rows
+        rows_to_delete: List[int] = [
+            y_pos for y_pos in rows if current_rows[y_pos] == full_row_mask
         ]
         if not rows_to_delete:
             return 0
-        for x in reversed(rows_to_delete):
-            del self.current_frame[x]
-        app = [
-            [0 for _ in range(self.x_size)] for _ in range(len(rows_to_delete))
-        ]
-        logger.debug('%d rows were deleted!', len(rows_to_delete))
-        self.current_frame = app + self.current_frame
-        return len(rows_to_delete)
+
+        deleted_rows_count: int = len(rows_to_delete)
+        lowest_row: int = rows_to_delete[-1]
+        for frame_rows in (current_rows, self.__stable_rows):
+            for y_pos in reversed(rows_to_delete):
+                del frame_rows[y_pos]
+            frame_rows[0:0] = [0] * deleted_rows_count
+        # everything above the lowest deleted row moved; one range instead
+        # of every changed cell keeps big boards cheap
+        self.shifted_rows = max(self.shifted_rows, lowest_row + 1)
+        logger.debug('%d rows were deleted!', deleted_rows_count)
+        return deleted_rows_count
 
     def is_almost_filled(self) -> bool:
-        if sum(self.current_frame[1]) > len(self.current_frame[1]) / 2:
+        if bin(self.current_rows[1]).count('1') > self.x_size / 2:
             return True
         return False
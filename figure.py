@@ -1,25 +1,35 @@
-import copy
 import logging
 import random
-from typing import List
+from typing import List, Optional
 
-from figures_templates import possible_figures_templates
+from figures_templates import Shape, shapes
 
 logger = logging.getLogger(__name__)
 
 
 class Figure:
+    # shape data is shared with figures_templates.shapes, the figure only
+    # owns its position; figures are recycled by FiguresFactory
+    __slots__ = ('x_size', 'y_size', 'area', 'row_masks', 'id', 'current_pos')
+
     def __init__(
-            self, template: list, target_field_width: int, figure_id: int,
+            self,
+            target_field_width: int,
+            figure_id: int,
+            rng: random.Random = None,
+            pos_x: Optional[int] = None,
     ):
-        self.x_size = len(template[0])
-        self.y_size = len(template)
-        self.area: List[List] = copy.deepcopy(template)
-        self.id = figure_id
-        self.current_pos = [
-            random.randint(0, target_field_width - self.x_size),
-            -1,
-        ]  # [x, y] starts from y=-1
+        self.current_pos: List[int] = [0, -1]  # [x, y] starts from y=-1
+        if pos_x is None:
+            pos_x = (rng or random).randint(
+                0, target_field_width - shapes[figure_id].x_size,
+            )
+        self.reset(figure_id, pos_x)
+
+    def reset(self, figure_id: int, pos_x: int):
+        self.transform(figure_id)
+        self.current_pos[0] = pos_x
+        self.current_pos[1] = -1
 
     def __str__(self):
         return (
@@ -28,8 +38,10 @@ class Figure:
         )
 
     def transform(self, figure_id: int):
-        new_template: List[List[int]] = possible_figures_templates[figure_id]
-        self.x_size = len(new_template[0])
-        self.y_size = len(new_template)
-        self.area = copy.deepcopy(new_template)
+        # shapes are immutable and shared, no need to copy them
+        new_shape: Shape = shapes[figure_id]
+        self.x_size = new_shape.x_size
+        self.y_size = new_shape.y_size
+        self.area = new_shape.area
+        self.row_masks = new_shape.row_masks
         self.id = figure_id
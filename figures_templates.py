@@ -1,22 +1,23 @@
-from typing import Tuple, Optional, List
+from typing import Dict, NamedTuple, Tuple, Optional, List
 
 
 class Sequence:
     def __init__(self, values: Tuple):
         self._values: Tuple = values
-        self._index: int = -1
+        self._next: Dict[int, int] = {
+            value: values[(i + 1) % len(values)]
+            for i, value in enumerate(values)
+        }
 
     def __contains__(self, item: int) -> bool:
-        return item in self._values
+        return item in self._next
+
+    @property
+    def values(self) -> Tuple:
+        return self._values
 
     def next_elem(self, value: int) -> Optional[int]:
-        if value not in self._values:
-            return None
-        for i in range(len(self._values)):
-            if self._values[i] == value:
-                if i < len(self._values) - 1:
-                    return self._values[i + 1]
-                return self._values[0]
+        return self._next.get(value)
 
 
 figures_sequences: List[Sequence] = [
@@ -29,9 +30,8 @@ figures_sequences: List[Sequence] = [
 
 
 def get_id_next_figure(current_fig_id: int) -> int:
-    for seq in figures_sequences:
-        if current_fig_id in seq:
-            return seq.next_elem(current_fig_id)
+    if 0 <= current_fig_id < len(shapes):
+        return shapes[current_fig_id].next_id
     return -1
 
 
@@ -50,3 +50,51 @@ possible_figures_templates: List[List[List[int]]] = [
     [[1, 1, 1, 1]],
     [[1], [1], [1], [1]],
 ]
+
+
+class Shape(NamedTuple):
+    id: int
+    x_size: int
+    y_size: int
+    area: Tuple[Tuple[int, ...], ...]
+    cells: Tuple[Tuple[int, int], ...]  # (x, y) offsets of filled cells
+    row_masks: Tuple[int, ...]  # bit x of row y is set for filled [y][x]
+    bottom_profile: Tuple[int, ...]  # lowest filled y for every column
+    next_id: int  # id of the shape after one rotation
+
+
+def compile_shape(figure_id: int, template: List[List[int]]) -> Shape:
+    area: Tuple[Tuple[int, ...], ...] = tuple(tuple(row) for row in template)
+    cells: Tuple[Tuple[int, int], ...] = tuple(
+        (x, y)
+        for y, row in enumerate(area)
+        for x, cell in enumerate(row)
+        if cell == 1
+    )
+    next_id: int = figure_id
+    for seq in figures_sequences:
+        if figure_id in seq:
+            next_id = seq.next_elem(figure_id)
+    return Shape(
+        id=figure_id,
+        x_size=len(area[0]),
+        y_size=len(area),
+        area=area,
+        cells=cells,
+        row_masks=tuple(
+            sum(1 << x for x, cell in enumerate(row) if cell == 1)
+            for row in area
+        ),
+        bottom_profile=tuple(
+            max(y for y, row in enumerate(area) if row[x] == 1)
+            for x in range(len(area[0]))
+        ),
+        next_id=next_id,
+    )
+
+
+# compiled once at import, shared by every Figure and Field
+shapes: Tuple[Shape, ...] = tuple(
+    compile_shape(figure_id, template)
+    for figure_id, template in enumerate(possible_figures_templates)
+)
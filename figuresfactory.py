@@ -1,25 +1,137 @@
 from figure import Figure
+import itertools
 import random
+from collections import deque
+from typing import Deque, List, Sequence, Tuple
 
-from figures_templates import possible_figures_templates
+from figures_templates import (
+    figures_sequences,
+    possible_figures_templates,
+    shapes,
+)
+from settings import FIGURES_PREVIEW_SIZE
+
+# released figures kept for reuse; a game has one live figure at a time
+FIGURES_POOL_SIZE = 8
+
+PlannedFigure = Tuple[int, int]  # (figure id, spawn column)
+
+
+class UniformGenerator:
+    # every shape id is equally likely, so families with more rotations
+    # come more often; the original behaviour of the game
+    def next_id(self, rng: random.Random) -> int:
+        return rng.randint(0, len(possible_figures_templates) - 1)
+
+
+class BagGenerator:
+    # every rotation family comes once per bag, in random order, in a
+    # random rotation; no family is missing for long
+    def __init__(self):
+        self.families: List[Tuple[int, ...]] = [
+            sequence.values for sequence in figures_sequences
+        ]
+        self.bag: List[Tuple[int, ...]] = []
+
+    def next_id(self, rng: random.Random) -> int:
+        if not self.bag:
+            self.bag = list(self.families)
+            rng.shuffle(self.bag)
+        family: Tuple[int, ...] = self.bag.pop()
+        return family[rng.randrange(len(family))]
+
+
+class WeightedGenerator:
+    # one weight per shape id
+    def __init__(self, weights: Sequence[float]):
+        if len(weights) != len(shapes):
+            raise ValueError(f'Expected {len(shapes)} weights')
+        self.ids: range = range(len(shapes))
+        self.cum_weights: List[float] = list(itertools.accumulate(weights))
+
+    def next_id(self, rng: random.Random) -> int:
+        return rng.choices(self.ids, cum_weights=self.cum_weights)[0]
 
 
 class FiguresFactory:
-    def __init__(self, target_field_width: int):
+    def __init__(
+            self,
+            target_field_width: int,
+            rng: random.Random = None,
+            generator=None,
+            preview_size: int = FIGURES_PREVIEW_SIZE,
+    ):
         self.target_field_width = target_field_width
+        # own generator makes the sequence of figures reproducible by seed
+        self.rng = rng or random.Random()
+        self.generator = generator or UniformGenerator()
+        self.preview_size: int = preview_size
+        # figures planned ahead, spawned in this order
+        self.queue: Deque[PlannedFigure] = deque()
+        self.pool: List[Figure] = []
 
-    def get_figure(self) -> Figure:
-        figure_id: int = random.randint(0, len(possible_figures_templates) - 1)
-        template = possible_figures_templates[figure_id]
-        return Figure(
-            template=template,
-            target_field_width=self.target_field_width,
-            figure_id=figure_id,
+    def pregenerate(self, count: int):
+        # ids and spawn columns are drawn in the same order whatever the
+        # batch size, so a seed gives the same figures with any lookahead
+        rng: random.Random = self.rng
+        next_id = self.generator.next_id
+        target_field_width: int = self.target_field_width
+        for _ in range(count):
+            figure_id: int = next_id(rng)
+            self.queue.append(
+                (
+                    figure_id,
+                    rng.randint(
+                        0, target_field_width - shapes[figure_id].x_size,
+                    ),
+                ),
+            )
+
+    def preview(self, count: int = None) -> List[int]:
+        count = self.preview_size if count is None else count
+        if len(self.queue) < count:
+            self.pregenerate(count - len(self.queue))
+        return [
+            figure_id for figure_id, _ in itertools.islice(self.queue, count)
+        ]
+
+    def take(self, count: int) -> Tuple[List[int], List[int]]:
+        # the next `count` figures as ids and spawn columns, for headless
+        # simulations that do not need Figure objects
+        if len(self.queue) < count:
+            self.pregenerate(count - len(self.queue))
+        planned: List[PlannedFigure] = [
+            self.queue.popleft() for _ in range(count)
+        ]
+        return (
+            [figure_id for figure_id, _ in planned],
+            [pos_x for _, pos_x in planned],
         )
 
+    def get_figure(self) -> Figure:
+        if not self.queue:
+            self.pregenerate(max(self.preview_size, 1))
+        return self.__make_figure(*self.queue.popleft())
+
     def get_specific_figure(self, figure_id: int) -> Figure:
+        pos_x: int = self.rng.randint(
+            0, self.target_field_width - shapes[figure_id].x_size,
+        )
+        return self.__make_figure(figure_id, pos_x)
+
+    def release(self, figure: Figure):
+        # the caller must not use the figure afterwards, it is handed out
+        # again by the next get_figure
+        if len(self.pool) < FIGURES_POOL_SIZE:
+            self.pool.append(figure)
+
+    def __make_figure(self, figure_id: int, pos_x: int) -> Figure:
+        if self.pool:
+            figure: Figure = self.pool.pop()
+            figure.reset(figure_id, pos_x)
+            return figure
         return Figure(
-            template=possible_figures_templates[figure_id],
             target_field_width=self.target_field_width,
             figure_id=figure_id,
+            pos_x=pos_x,
         )
@@ -0,0 +1,168 @@
+import logging
+import random
+from enum import Enum
+from typing import NamedTuple, Optional, Tuple
+
+from field import Field
+from figure import Figure
+from figuresfactory import FiguresFactory
+from settings import SPEED_LEVELS
+from tracing import trace
+
+logger = logging.getLogger(__name__)
+
+GAME_OVER_FIELD_FILLED = 'field_filled'
+GAME_OVER_SPEED_CAP = 'speed_cap'
+
+
+class Action(Enum):
+    TICK = 0  # one game frame, gravity works every SPEED_LEVELS[...] ticks
+    LEFT = 1
+    RIGHT = 2
+    ROTATE = 3
+    SOFT_DROP = 4  # move the figure down on the next tick
+
+
+class GameState(NamedTuple):
+    ticks: int
+    points: int
+    pieces: int
+    speed_level: int
+    lines_cleared: int  # by the last step
+    figure_locked: bool  # by the last step
+    game_over: bool
+    game_over_reason: Optional[str]
+
+
+class GameCore:
+    def __init__(
+            self,
+            field_v_size: int = 20,
+            field_h_size: int = 10,
+            figures_factory: FiguresFactory = None,
+            seed: Optional[int] = None,
+    ):
+        self.field = Field(field_v_size, field_h_size)
+        self.figures_factory = figures_factory or FiguresFactory(
+            self.field.x_size, random.Random(seed),
+        )
+
+        self.ticks: int = 0
+        self.points: int = 0
+        self.pieces: int = 0
+        self.speed_level: int = 1
+        self.frame_counter: int = 0
+
+        self.game_over: bool = False
+        self.game_over_reason: Optional[str] = None
+
+        self.figure_moves_counter: int = 0
+        self.move_figure_down_immediately: bool = False
+        # flag for force redrawing the field during success rotation attempt
+        self.figure_just_rotated: bool = False
+        self.current_figure: Figure = self.__spawn_figure()
+        self.last_state: GameState = self.__state(0, False)
+
+    def step(self, action: Action = Action.TICK) -> GameState:
+        if self.game_over:
+            return self.last_state
+
+        if action == Action.TICK:
+            self.last_state = self.__tick()
+            return self.last_state
+        trace.record('action', self.ticks, action.name)
+        if action == Action.LEFT:
+            self.field.try_to_move_horizontally(self.current_figure, -1)
+        elif action == Action.RIGHT:
+            self.field.try_to_move_horizontally(self.current_figure, 1)
+        elif action == Action.ROTATE:
+            self.figure_just_rotated = self.field.try_to_rotate_figure(
+                self.current_figure,
+            )
+        elif action == Action.SOFT_DROP:
+            self.move_figure_down_immediately = True
+        self.last_state = self.__state(0, False)
+        return self.last_state
+
+    def __tick(self) -> GameState:
+        self.ticks += 1
+        if (
+                self.frame_counter < SPEED_LEVELS[self.speed_level - 1]
+                and not self.move_figure_down_immediately
+        ):
+            self.frame_counter += 1
+            return self.__state(0, False)
+
+        self.frame_counter = 0
+        stop_moving_current_figure, points = self.move_current_figure_down()
+
+        if self.speed_level == len(SPEED_LEVELS) - 1:
+            logger.debug(
+                'Player was reached the highest speed level! Exit game!',
+            )
+            self.__finish(GAME_OVER_SPEED_CAP)
+        elif (
+                stop_moving_current_figure
+                and self.figure_moves_counter == 0
+                and self.field.is_almost_filled()
+        ):
+            logger.debug('Field is almost filled: exit game!')
+            self.__finish(GAME_OVER_FIELD_FILLED)
+        elif stop_moving_current_figure:
+            # the locked figure is part of the field rows now
+            self.figures_factory.release(self.current_figure)
+            self.current_figure = self.__spawn_figure()
+        else:
+            self.figure_moves_counter += 1
+        return self.__state(points, stop_moving_current_figure)
+
+    def move_current_figure_down(self) -> Tuple[bool, int]:
+        is_bottom_intersection, redraw_rotation = (
+            self.field.try_to_move_vertically(
+                figure=self.current_figure,
+                shift=1,
+                just_rotated=self.figure_just_rotated,
+            )
+        )
+        stop_moving_current_figure, points = self.field.overlay(
+            figure=self.current_figure,
+            is_bottom_intersection=is_bottom_intersection,
+            redraw_rotation=redraw_rotation,
+        )
+        if stop_moving_current_figure:
+            trace.record(
+                'lock', self.ticks, self.current_figure.id,
+                *self.current_figure.current_pos, points,
+            )
+        if points != 0:
+            logger.debug('Getting new game points!')
+            self.points += points
+            if self.points >= 10:
+                self.speed_level = self.points // 10 + 1
+        return stop_moving_current_figure, points
+
+    def __spawn_figure(self) -> Figure:
+        self.pieces += 1
+        self.figure_moves_counter = 0
+        self.move_figure_down_immediately = False
+        self.figure_just_rotated = False
+        figure: Figure = self.figures_factory.get_figure()
+        trace.record('spawn', self.ticks, figure.id, figure.current_pos[0])
+        return figure
+
+    def __finish(self, reason: str):
+        trace.record('game_over', self.ticks, reason, self.points)
+        self.game_over = True
+        self.game_over_reason = reason
+
+    def __state(self, lines_cleared: int, figure_locked: bool) -> GameState:
+        return GameState(
+            ticks=self.ticks,
+            points=self.points,
+            pieces=self.pieces,
+            speed_level=self.speed_level,
+            lines_cleared=lines_cleared,
+            figure_locked=figure_locked,
+            game_over=self.game_over,
+            game_over_reason=self.game_over_reason,
+        )
@@ -1,33 +1,59 @@
 import logging
+import math
+import os
+import time
+import uuid
 from datetime import datetime
 
 import pygame
-from typing import Tuple, List
+from typing import List, Optional, Tuple
 
-from field import Field
-from figure import Figure
-from figuresfactory import FiguresFactory
+from dirty_regions import DirtyRegions
+from game_core import Action, GameCore, GameState
 from images.background import Background
 from images.clock import ClockFace, ClockFrame
 from images.particles import Particle, PointImage
+from images.static_layer import StaticLayer
+from images.text_cache import TextRenderCache
+from profiler import FrameProfiler
+from replay import Replay, ReplayPlayer, new_seed
 from scores.scores import Scores
 from settings import (
     SCREEN_RESOLUTION,
     WINDOWS_CAPTION,
-    SPEED_LEVELS,
     MENU_FONT_SIZE,
     SPEED_LABEL_FONT_SIZE,
     SCORES_LABEL_FONT_SIZE,
     MAX_FPS,
+    BACKGROUND_SOURCE,
+    LOGIC_TICK_RATE,
+    MAX_CATCHUP_TICKS,
+    FIELD_V_SIZE,
+    FIELD_H_SIZE,
+    MAIN_DIR,
+    PROFILER_ENABLED,
+    PROFILER_OVERLAY_REFRESH,
+    LEADERBOARD_SIZE,
 )
+from tracing import trace
+from viewport import Viewport
 
 logger = logging.getLogger(__name__)
 
 
 class GameLevel:
-    def __init__(self, current_user: str, scores: Scores):
+    def __init__(
+            self,
+            current_user: str,
+            scores: Optional[Scores],
+            replay_dir: Optional[str] = None,
+            replay: Optional[Replay] = None,
+            replay_speed: float = 1.0,
+            field_v_size: int = FIELD_V_SIZE,
+            field_h_size: int = FIELD_H_SIZE,
+    ):
 
-        self.scores: Scores = scores
+        self.scores: Optional[Scores] = scores
 
         # init pygame parameters
         pygame.init()
@@ -48,120 +74,206 @@ class GameLevel:
         self.start_screen_font: pygame.font.Font = pygame.font.Font(None, 48)
         self.clock: pygame.time.Clock = pygame.time.Clock()
 
-        self.field_v_size: int = 20
-        self.field_h_size: int = 10
-        self.background_images: Background = Background('bottle')
+        # a replay is played on the field size it was recorded on
+        if replay is not None:
+            field_v_size = replay.field_v_size
+            field_h_size = replay.field_h_size
+        self.field_v_size: int = field_v_size
+        self.field_h_size: int = field_h_size
+        self.viewport: Viewport = Viewport(field_v_size, field_h_size)
+        self.border_width: int = 5
+        self.background_images: Background = Background(BACKGROUND_SOURCE)
         self.points_clock_face: ClockFace = ClockFace('digits')
         self.clock_images_representation: List[
             Tuple
         ] = self.points_clock_face.get_digits_representation()
         self.clock_frame: ClockFrame = ClockFrame('frame.png')
         self.particle: Particle = Particle('obstacle.bmp')
+        self.cell_image: pygame.Surface = self.__scale_cell_image()
         self.get_point: PointImage = PointImage('point.png')
 
         self.screen.blit(next(self.background_images), (0, 0))
 
-        self.field = Field(self.field_v_size, self.field_h_size)
-        self.figures_factory = FiguresFactory(self.field.x_size)
+        # inputs of this game are recorded to replay_dir; with a replay
+        # given, the recorded inputs are played back instead of the keyboard
+        self.replay_dir: Optional[str] = replay_dir
+        self.replay_player: Optional[ReplayPlayer] = None
+        if replay is not None:
+            self.replay_player = ReplayPlayer(replay)
+            self.replay: Replay = replay
+            self.core: GameCore = self.replay_player.core
+        else:
+            self.replay = Replay(
+                new_seed(), self.field_v_size, self.field_h_size,
+            )
+            self.core = self.replay.new_core()
+        self.replay_saved: bool = False
+        self.field = self.core.field
 
         self.move_counter: int = 0
-        self.frame_counter: int = 0
-        self.speed_level: int = 1
+
+        # fixed timestep: logic ticks run at LOGIC_TICK_RATE whatever the
+        # frame rate is, unused frame time is carried to the next frame
+        self.tick_duration: float = 1 / (LOGIC_TICK_RATE * replay_speed)
+        self.max_catchup_ticks: int = MAX_CATCHUP_TICKS * math.ceil(
+            max(replay_speed, 1),
+        )
+        self.time_accumulator: float = 0.0
+        self.last_frame_time: float = time.perf_counter()
+        self.point_image_visible: bool = False
+        self.drawn_background: Optional[pygame.Surface] = None
+
+        # only changed screen areas are sent to the display, see draw_field
+        self.dirty_regions: DirtyRegions = DirtyRegions()
+        self.need_full_redraw: bool = True
+        self.hud_state: Tuple = ()
+        self.text_cache: TextRenderCache = TextRenderCache()
+        self.static_layer: StaticLayer = StaticLayer(SCREEN_RESOLUTION)
 
         self.pause: bool = False
-        self.move_figure_down_immediately: bool = False
-        self.figure_just_rotated: bool = False  # flag for force redrawing the field during success rotation attempt
         self.need_to_quit: bool = False
-        self.start_screen_active: bool = True
+        self.start_screen_active: bool = self.replay_player is None
+
+        # frame phase timings; F3 shows them, F4 exports a Chrome trace
+        self.profiler: FrameProfiler = FrameProfiler()
+        self.profiler_overlay: bool = False
+        self.profiler_font: pygame.font.Font = pygame.font.Font(None, 18)
+        self.profiler_image: Optional[pygame.Surface] = None
+        self.profiler_frames: int = 0
 
         self.current_user: str = current_user
         self.show_best_scores: bool = False
+        # the result of this game is recorded once under this id
+        self.session_id: str = uuid.uuid4().hex
 
     # returns False if it's possible to stop updating
     def update_field(self) -> bool:
         self.move_counter += 1
         logger.debug('------- move_counter=%d', self.move_counter)
-        current_figure: Figure = self.figures_factory.get_figure()
-        figure_moves_counter: int = 0
         stop_moving_current_figure: bool = False  # current_figure have to stop due to field collision
-        self.figure_just_rotated = False
-        self.move_figure_down_immediately = False
 
         while not stop_moving_current_figure:
-            self.clock.tick(MAX_FPS)
-            self.process_events_queue(current_figure)
-
-            if self.need_to_quit:
-                return False
-
-            if self.show_best_scores:
-                self.scores.update(
-                    score=self.points_clock_face.get_points(),
-                    username=self.current_user,
-                    timestamp=datetime.now().strftime('%Y-%m-%dT%H:%M:%S'),
-                )
-                self.draw_show_best_scores()
-                continue
-
-            if self.start_screen_active:
-                self.draw_start_screen()
-                continue
-
-            if self.pause:
-                self.draw_pause_menu_screen()
-                continue
-
-            if (
-                    self.frame_counter < SPEED_LEVELS[self.speed_level - 1]
-                    and not self.move_figure_down_immediately
-            ):
-                self.frame_counter += 1
-                self.draw_field()
-                continue
-
-            self.frame_counter = 0
-            logger.debug('Scene update...')
-            stop_moving_current_figure = self.render_current_figure_movement(
-                current_figure,
-            )
+            with self.profiler.phase('wait'):
+                self.clock.tick(MAX_FPS)
+            with self.profiler.phase('frame'):
+                now: float = time.perf_counter()
+                self.time_accumulator += now - self.last_frame_time
+                self.last_frame_time = now
+                with self.profiler.phase('events'):
+                    self.process_events_queue()
+
+                if self.need_to_quit:
+                    self.background_images.close()
+                    self.__save_replay()
+                    return False
+
+                if (
+                        self.show_best_scores
+                        or self.start_screen_active
+                        or self.pause
+                ):
+                    # game time does not run behind menus
+                    self.time_accumulator = 0.0
+
+                if self.show_best_scores:
+                    self.draw_show_best_scores()
+                    continue
+
+                if self.start_screen_active:
+                    self.draw_start_screen()
+                    continue
+
+                if self.pause:
+                    self.draw_pause_menu_screen()
+                    continue
+
+                with self.profiler.phase('logic'):
+                    stop_moving_current_figure = self.__run_ticks()
+
+                if self.show_best_scores:
+                    continue
+                with self.profiler.phase('draw'):
+                    self.draw_field()
+        return True
 
-            if self.speed_level == len(SPEED_LEVELS) - 1:
-                logger.debug(
-                    'Player was reached the highest speed level! Exit game!',
-                )
-                self.show_best_scores = True
-                continue
-
-            if (
-                    stop_moving_current_figure
-                    and figure_moves_counter == 0
-                    and self.field.is_almost_filled()
-            ):
-                logger.debug('Field is almost filled: exit game!')
-                self.show_best_scores = True
-                continue
-
-            figure_moves_counter += 1
-            logger.debug(
-                'figure=%s, figure_moves_counter=%d',
-                current_figure,
-                figure_moves_counter,
+    # returns True when the current figure is locked
+    def __run_ticks(self) -> bool:
+        ticks: int = 0
+        while self.time_accumulator >= self.tick_duration:
+            if ticks == self.max_catchup_ticks:
+                # too far behind: drop the rest instead of spiralling,
+                # the game slows down only in this case
+                self.time_accumulator = 0.0
+                break
+            self.time_accumulator -= self.tick_duration
+            ticks += 1
+            state: GameState = self.__tick()
+            if state.game_over:
+                break
+            if state.figure_locked:
+                return True
+        return False
+
+    def __tick(self) -> GameState:
+        if self.replay_player is not None:
+            if self.replay_player.finished:
+                # the recorded game was quit before it was over
+                self.need_to_quit = True
+                return self.core.last_state
+            state: GameState = self.replay_player.step()
+        else:
+            state = self.core.step(Action.TICK)
+        next(self.background_images)
+        self.point_image_visible = self.get_point.need_to_draw()
+        if state.lines_cleared != 0:
+            self.show_points(state.points)
+
+        if state.game_over:
+            logger.info('Game over: %s', state.game_over_reason)
+            trace.dump(logger, logging.INFO)
+            self.__save_replay()
+            if self.scores is None:
+                self.need_to_quit = True
+                return state
+            self.scores.submit(
+                session_id=self.session_id,
+                score=self.core.points,
+                username=self.current_user,
+                timestamp=datetime.now().strftime('%Y-%m-%dT%H:%M:%S'),
             )
-            self.draw_field()
-        return True
+            self.show_best_scores = True
+        logger.debug(
+            'figure=%s, figure_moves_counter=%d',
+            self.core.current_figure,
+            self.core.figure_moves_counter,
+        )
+        return state
 
-    def process_events_queue(self, current_figure: Figure):
+    def process_events_queue(self):
         # process events queue
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 logger.debug('Exit game!')
                 self.need_to_quit = True
             elif event.type == pygame.KEYDOWN:
-                self.process_keydown(event, current_figure)
-
-    def process_keydown(
-            self, event: pygame.event.Event, current_figure: Figure,
-    ):
+                self.process_keydown(event)
+
+    def process_keydown(self, event: pygame.event.Event):
+        if event.key == pygame.K_F3:
+            self.profiler_overlay = not self.profiler_overlay
+            self.profiler.enabled = self.profiler_overlay or PROFILER_ENABLED
+            self.profiler_image = None
+            self.need_full_redraw = True
+            return
+        if event.key == pygame.K_F4:
+            self.__export_frame_trace()
+            return
+        if event.key in (pygame.K_MINUS, pygame.K_EQUALS):
+            step: int = 1 if event.key == pygame.K_EQUALS else -1
+            if self.viewport.zoom(step):
+                self.cell_image = self.__scale_cell_image()
+                self.need_full_redraw = True
+            return
         if self.start_screen_active:
             self.start_screen_active = False
             return
@@ -177,52 +289,105 @@ class GameLevel:
             if self.show_best_scores:
                 self.need_to_quit = True
                 logger.debug('End game')
-        elif not self.pause:
+        elif not self.pause and self.replay_player is None:
             if event.key == pygame.K_LEFT:
                 logger.debug('PRESSED BUTTON K_LEFT')
-                self.field.try_to_move_horizontally(current_figure, -1)
+                self.__apply(Action.LEFT)
             elif event.key == pygame.K_RIGHT:
                 logger.debug('PRESSED BUTTON K_RIGHT')
-                self.field.try_to_move_horizontally(current_figure, 1)
+                self.__apply(Action.RIGHT)
             elif event.key == pygame.K_SPACE:
                 logger.debug('PRESSED BUTTON K_SPACE')
-                self.figure_just_rotated = self.field.try_to_rotate_figure(
-                    current_figure,
+                self.__apply(Action.ROTATE)
+                logger.debug(
+                    'after_rotate_attempt: %s', self.core.current_figure,
                 )
-                logger.debug('after_rotate_attempt: %s', current_figure)
             elif event.key == pygame.K_DOWN:
                 logger.debug('PRESSED BUTTON K_DOWN')
-                self.move_figure_down_immediately = True
-
-    def render_current_figure_movement(self, current_figure) -> bool:
-        is_bottom_intersection, redraw_rotation = (
-            self.field.try_to_move_vertically(
-                figure=current_figure,
-                shift=1,
-                just_rotated=self.figure_just_rotated,
-            )
+                self.__apply(Action.SOFT_DROP)
+
+    def __apply(self, action: Action):
+        if not self.core.game_over:
+            self.replay.record(self.core.ticks, action)
+        self.core.step(action)
+
+    def __save_replay(self):
+        if (
+                self.replay_dir is None
+                or self.replay_player is not None
+                or self.replay_saved
+                or self.core.ticks == 0
+        ):
+            return
+        self.replay_saved = True
+        self.replay.finish(self.core.ticks)
+        filename: str = os.path.join(
+            self.replay_dir,
+            f'{datetime.now():%Y%m%dT%H%M%S}-{self.session_id[:8]}.replay',
         )
-        stop_moving_current_figure, points = self.field.overlay(
-            figure=current_figure,
-            is_bottom_intersection=is_bottom_intersection,
-            redraw_rotation=redraw_rotation,
+        self.replay.save(filename)
+        logger.info('Replay saved to %s', filename)
+
+    def show_points(self, points: int):
+        # the clock face only displays points counted by the game core
+        logger.debug('Getting new game points!')
+        self.points_clock_face.set_points(points)
+        self.get_point.activated = True
+        self.clock_images_representation = (
+            self.points_clock_face.get_digits_representation()
         )
-        if points != 0:
-            logger.debug('Getting new game points!')
-            self.points_clock_face.add_points(points)
-            self.get_point.activated = True
-            self.clock_images_representation = (
-                self.points_clock_face.get_digits_representation()
-            )
-            if self.points_clock_face.points_int >= 10:
-                self.speed_level = self.points_clock_face.points_int // 10 + 1
-        return stop_moving_current_figure
 
     def draw_field(self):
-        cell_x_size: int = 20
-        cell_y_size: int = 20
-        border_width: int = 5
+        if logger.isEnabledFor(logging.DEBUG):
+            self.__log_field()
 
+        # the background is advanced by logic ticks, several of them may
+        # have run since the last rendered frame
+        background_image: pygame.Surface = (
+            self.background_images.current_image
+        )
+        hud_state: Tuple = (
+            self.core.points,
+            self.core.speed_level,
+            self.current_user,
+            self.point_image_visible,
+        )
+        figure = self.core.current_figure
+        scrolled: bool = self.viewport.follow(
+            *figure.current_pos, figure.x_size, figure.y_size,
+        )
+        full_frame: bool = (
+            self.need_full_redraw
+            or scrolled
+            or background_image is not self.drawn_background
+            or hud_state != self.hud_state
+        )
+        if full_frame:
+            self.__draw_full_frame(background_image, hud_state[-1])
+            self.field.pop_dirty_cells()
+            self.field.pop_shifted_rows()
+            self.dirty_regions.invalidate()
+        else:
+            # only cells changed by the field since the last frame
+            with self.profiler.phase('draw.cells'):
+                shifted_rows: int = self.field.pop_shifted_rows()
+                if shifted_rows:
+                    self.__draw_rows(background_image, shifted_rows)
+                for elem_num, row_num in self.field.pop_dirty_cells():
+                    if row_num >= shifted_rows:
+                        self.__draw_cell(background_image, row_num, elem_num)
+        self.hud_state = hud_state
+        self.drawn_background = background_image
+        self.need_full_redraw = False
+
+        if self.profiler_overlay:
+            with self.profiler.phase('draw.overlay'):
+                self.__draw_profiler_overlay(full_frame)
+        with self.profiler.phase('display.update'):
+            self.dirty_regions.flush()
+        logger.debug('+++++++++++++++++++++++++++++++++++++++')
+
+    def __log_field(self):
         logger.debug('=' * (len(self.field.current_frame[0]) + 2))
         for line in self.field.current_frame:
             logger.debug(
@@ -234,57 +399,189 @@ class GameLevel:
             )
         logger.debug('=' * (len(self.field.current_frame[0]) + 2))
 
+    def __draw_cell(
+            self,
+            background_image: pygame.Surface,
+            row_num: int,
+            elem_num: int,
+    ):
+        cell_rect: Optional[pygame.Rect] = self.viewport.cell_rect(
+            elem_num, row_num,
+        )
+        if cell_rect is None:
+            return
+        self.screen.blit(
+            source=background_image, dest=cell_rect, area=cell_rect,
+        )
+        if (self.field.current_rows[row_num] >> elem_num) & 1:
+            self.screen.blit(source=self.cell_image, dest=cell_rect)
+        self.dirty_regions.add(cell_rect)
+
+    def __draw_rows(self, background_image: pygame.Surface, rows_count: int):
+        # rows 0..rows_count - 1 moved down after a line clear
+        viewport: Viewport = self.viewport
+        visible_rows: int = min(rows_count - viewport.first_row, viewport.rows)
+        if visible_rows <= 0:
+            return
+        rows_rect: pygame.Rect = pygame.Rect(
+            0, 0, viewport.pixel_size[0], visible_rows * viewport.cell_size,
+        )
+        self.screen.blit(
+            source=background_image, dest=rows_rect, area=rows_rect,
+        )
+        self.__draw_cells(
+            range(viewport.first_row, viewport.first_row + visible_rows),
+        )
+        self.dirty_regions.add(rows_rect)
+
+    def __draw_cells(self, rows: range):
+        # filled cells of the visible columns, found by their bits
+        viewport: Viewport = self.viewport
+        cell_size: int = viewport.cell_size
+        column_mask: int = viewport.column_mask
+        current_rows: List[int] = self.field.current_rows
+        for row_num in rows:
+            visible_cells: int = (
+                current_rows[row_num] >> viewport.first_column
+            ) & column_mask
+            pos_y: int = (row_num - viewport.first_row) * cell_size
+            while visible_cells:
+                lowest_bit: int = visible_cells & -visible_cells
+                self.screen.blit(
+                    source=self.cell_image,
+                    dest=((lowest_bit.bit_length() - 1) * cell_size, pos_y),
+                )
+                visible_cells ^= lowest_bit
+
+    def __scale_cell_image(self) -> pygame.Surface:
+        cell_size: int = self.viewport.cell_size
+        if self.particle.image.get_size() == (cell_size, cell_size):
+            return self.particle.image
+        return pygame.transform.scale(
+            self.particle.image, (cell_size, cell_size),
+        )
+
+    def __draw_full_frame(
+            self, background_image: pygame.Surface, draw_point: bool,
+    ):
         # draw background
-        background_image = next(self.background_images)
-        self.screen.blit(source=background_image, dest=(0, 0))
+        with self.profiler.phase('draw.background'):
+            self.screen.blit(source=background_image, dest=(0, 0))
+
+        # draw the field
+        with self.profiler.phase('draw.cells'):
+            self.__draw_cells(
+                range(
+                    self.viewport.first_row,
+                    self.viewport.first_row + self.viewport.rows,
+                ),
+            )
+
+        with self.profiler.phase('draw.static'):
+            # draw image for new points get
+            if draw_point:
+                self.screen.blit(
+                    source=self.get_point.image,
+                    dest=self.get_point.position,
+                )
+
+            # draw borders, clock and labels, rebuilt only when they change
+            static_layer: pygame.Surface = self.static_layer.get(
+                key=(
+                    self.core.points,
+                    self.core.speed_level,
+                    self.current_user,
+                    self.viewport.pixel_size,
+                ),
+                builder=self.__build_static_layer,
+            )
+            self.screen.blit(source=static_layer, dest=(0, 0))
+
+    def __draw_profiler_overlay(self, full_frame: bool):
+        # an opaque box between the field and the clock; it is blitted
+        # again only when its text changes or a full frame covered it
+        refresh: bool = self.profiler_frames % PROFILER_OVERLAY_REFRESH == 0
+        self.profiler_frames += 1
+        if refresh or self.profiler_image is None:
+            self.profiler_image = self.__build_profiler_overlay()
+        elif not full_frame:
+            return
+        position: Tuple[int, int] = (215, 104)
+        self.screen.blit(source=self.profiler_image, dest=position)
+        self.dirty_regions.add(
+            pygame.Rect(position, self.profiler_image.get_size()),
+        )
+
+    def __build_profiler_overlay(self) -> pygame.Surface:
+        line_height: int = 14
+        columns: Tuple[int, ...] = (4, 122, 160, 198)
+        image: pygame.Surface = pygame.Surface((236, line_height * 13 + 4))
+        image.fill((20, 20, 20))
+        rows: List[Tuple[str, ...]] = [('phase, ms', 'p50', 'p95', 'p99')]
+        for name, percentiles in self.profiler.summary()[:12]:
+            rows.append(
+                (name, *(f'{value * 1000:.2f}' for value in percentiles)),
+            )
+        for row_num, row in enumerate(rows):
+            for column, text in zip(columns, row):
+                image.blit(
+                    source=self.profiler_font.render(
+                        text, True, (230, 230, 230),
+                    ),
+                    dest=(column, 2 + row_num * line_height),
+                )
+        return image
+
+    def __export_frame_trace(self):
+        logs_dir: str = os.path.join(MAIN_DIR, 'logs')
+        os.makedirs(logs_dir, exist_ok=True)
+        filename: str = os.path.join(
+            logs_dir, f'frames-{datetime.now():%Y%m%dT%H%M%S}.json',
+        )
+        self.profiler.export_chrome_trace(filename)
+        logger.info('Frame trace saved to %s', filename)
+
+    def __build_static_layer(self, layer: pygame.Surface):
+        with self.profiler.phase('draw.static_rebuild'):
+            self.__draw_static_layer(layer)
+
+    def __draw_static_layer(self, layer: pygame.Surface):
+        border_width: int = self.border_width
+        field_width, field_height = self.viewport.pixel_size
 
         # draw the field borders
         pygame.draw.line(
-            surface=self.screen,
+            surface=layer,
             color=(0, 0, 0),
-            start_pos=(0, 400 + border_width),
-            end_pos=(200, 400 + border_width),
+            start_pos=(0, field_height + border_width),
+            end_pos=(field_width, field_height + border_width),
             width=border_width,
         )
 
         pygame.draw.line(
-            surface=self.screen,
+            surface=layer,
             color=(0, 0, 0),
-            start_pos=(200 + border_width, 0),
-            end_pos=(200 + border_width, 400 + border_width),
+            start_pos=(field_width + border_width, 0),
+            end_pos=(field_width + border_width, field_height + border_width),
             width=border_width,
         )
 
-        # draw the field
-        for row_num in range(self.field_v_size):
-            for elem_num in range(self.field_h_size):
-                if self.field.current_frame[row_num][elem_num] == 1:
-                    self.screen.blit(
-                        source=self.particle.image,
-                        dest=(cell_y_size * elem_num, cell_x_size * row_num),
-                    )
-
-        # draw image for new points get
-        if self.get_point.need_to_draw():
-            self.screen.blit(
-                source=self.get_point.image, dest=self.get_point.position,
-            )
-
         # draw clocks frame
-        self.screen.blit(
+        layer.blit(
             source=self.clock_frame.image, dest=self.clock_frame.position,
         )
 
         # draw digits into frame
         for digit_record in self.clock_images_representation:
-            self.screen.blit(source=digit_record[0], dest=digit_record[1])
+            layer.blit(source=digit_record[0], dest=digit_record[1])
 
         # draw speed label
         self.__draw_custom_label(
-            label_text=f'Скорость: {self.speed_level}',
+            label_text=f'Скорость: {self.core.speed_level}',
             font=self.speed_label_font,
             label_position=(470, 50),
             update_display=False,
+            surface=layer,
         )
 
         # draw current user
@@ -293,36 +590,31 @@ class GameLevel:
             font=self.speed_label_font,
             label_position=(470, 80),
             update_display=False,
+            surface=layer,
         )
 
-        pygame.display.update()
-        logger.debug('+++++++++++++++++++++++++++++++++++++++')
-
     def draw_pause_menu_screen(self):
+        self.need_full_redraw = True
         self.__draw_custom_label('ПОСОСИТЕ ГОВНА', self.menu_font, (30, 200))
 
     def draw_start_screen(self):
+        self.need_full_redraw = True
         self.__draw_custom_label(
             'Жмякни по клавише, браток', self.start_screen_font, (70, 200),
         )
 
     def draw_show_best_scores(self):
-        sorted_scores = sorted(
-            self.scores.scores_table.get_scores(),
-            key=lambda x: int(x[0]),
-            reverse=True,
+        self.need_full_redraw = True
+        best_scores: List[Tuple[int, str, str]] = (
+            self.scores.scores_table.get_top(LEADERBOARD_SIZE)
         )
-        max_range: int = 5
         pos_y: int = 40
-        if len(sorted_scores) < 5:
-            max_range = len(sorted_scores)
 
         self.__draw_custom_label(
             'Топ братков', self.scores_label_font, (170, pos_y),
         )
         pos_y += 40
-        for i in range(max_range):
-            record = sorted_scores[i]
+        for i, record in enumerate(best_scores):
             self.__draw_custom_label(
                 label_text=f'{i+1}) {record[0]}, {record[1]}',
                 font=self.scores_label_font,
@@ -338,10 +630,13 @@ class GameLevel:
             text_color: Tuple = (0, 0, 0),
             background_color: Tuple = (255, 255, 255),
             update_display: bool = True,
+            surface: pygame.Surface = None,
     ):
-        custom_label: pygame.Surface = font.render(
-            label_text, True, text_color, background_color,
+        custom_label: pygame.Surface = self.text_cache.render(
+            font, label_text, True, text_color, background_color,
+        )
+        (surface or self.screen).blit(
+            source=custom_label, dest=label_position,
         )
-        self.screen.blit(source=custom_label, dest=label_position)
         if update_display:
             pygame.display.update()
@@ -0,0 +1,176 @@
+import json
+import logging
+import mmap
+import os
+import struct
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import pygame
+
+from settings import ASSET_PACK_FILE, DATA_FOLDER, MAIN_DIR
+
+logger = logging.getLogger(__name__)
+
+# Pack layout: header, JSON index, then raw 32-bit pixel rows of every asset
+# in the byte order named by the header. Index entries map an asset key to
+# (offset, width, height), offsets are counted from the start of the pixel
+# data.
+PACK_MAGIC = b'CRPK'
+PACK_VERSION = 2
+# magic, version, pixel byte order, index length
+PACK_HEADER = struct.Struct('<4sI4sI')
+# a byte order, not a machine word: the same on every platform, and one
+# of the formats of pygame.image.frombuffer since pygame 2.0
+PIXEL_FORMAT = 'RGBA'
+PIXEL_SIZE = 4
+
+ASSET_PACK_PATH = os.path.join(MAIN_DIR, DATA_FOLDER, ASSET_PACK_FILE)
+
+
+def asset_key(name: str, size: Optional[Tuple[int, int]] = None) -> str:
+    if size is None:
+        return name
+    return f'{name}@{size[0]}x{size[1]}'
+
+
+class AssetPack:
+    def __init__(self, path: str):
+        with open(path, 'rb') as file:
+            # copy-on-write mapping: surfaces get a writable buffer, the
+            # pack file itself is never modified
+            self.buffer: mmap.mmap = mmap.mmap(
+                file.fileno(), 0, access=mmap.ACCESS_COPY,
+            )
+        self.path: str = path
+        magic, version, pixel_format, index_size = PACK_HEADER.unpack_from(
+            self.buffer,
+        )
+        if magic != PACK_MAGIC or version != PACK_VERSION:
+            self.buffer.close()
+            raise ValueError(f'{path} is not a version {PACK_VERSION} asset pack')
+        if pixel_format.decode() != PIXEL_FORMAT:
+            self.buffer.close()
+            raise ValueError(f'{path} has {pixel_format!r} pixels')
+        self.data_offset: int = PACK_HEADER.size + index_size
+        self.index: Dict[str, List[int]] = json.loads(
+            self.buffer[PACK_HEADER.size:self.data_offset],
+        )
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.index
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def close(self):
+        self.buffer.close()
+
+    def stale_sources(self, data_dir: str) -> List[str]:
+        # source images changed after the pack was built
+        built: float = os.path.getmtime(self.path)
+        sources: Set[str] = {key.split('@')[0] for key in self.index}
+        return sorted(
+            name
+            for name in sources
+            if os.path.isfile(os.path.join(data_dir, name))
+            and os.path.getmtime(os.path.join(data_dir, name)) > built
+        )
+
+    def get(self, key: str) -> Optional[pygame.Surface]:
+        entry: Optional[List[int]] = self.index.get(key)
+        if entry is None:
+            return None
+        offset, width, height = entry
+        offset += self.data_offset
+        # the surface shares memory with the mapping, nothing is decoded
+        return pygame.image.frombuffer(
+            memoryview(self.buffer)[offset:offset + width * height * PIXEL_SIZE],
+            (width, height),
+            PIXEL_FORMAT,
+        )
+
+
+def write_pack(path: str, surfaces: Iterable[Tuple[str, pygame.Surface]]):
+    index: Dict[str, List[int]] = {}
+    chunks: List[bytes] = []
+    data_size: int = 0
+    for key, surface in surfaces:
+        width, height = surface.get_size()
+        pixels: bytes = pygame.image.tostring(surface, PIXEL_FORMAT)
+        index[key] = [data_size, width, height]
+        chunks.append(pixels)
+        data_size += len(pixels)
+
+    encoded_index: bytes = json.dumps(index).encode()
+    with open(path, 'wb') as file:
+        file.write(
+            PACK_HEADER.pack(
+                PACK_MAGIC,
+                PACK_VERSION,
+                PIXEL_FORMAT.encode(),
+                len(encoded_index),
+            ),
+        )
+        file.write(encoded_index)
+        for pixels in chunks:
+            file.write(pixels)
+
+
+_asset_pack: Optional[AssetPack] = None
+_asset_pack_checked: bool = False
+
+
+def get_asset_pack() -> Optional[AssetPack]:
+    global _asset_pack, _asset_pack_checked
+    if not _asset_pack_checked:
+        _asset_pack_checked = True
+        if os.path.isfile(ASSET_PACK_PATH):
+            try:
+                _asset_pack = AssetPack(ASSET_PACK_PATH)
+            except (OSError, ValueError):
+                logger.exception('Cannot open asset pack %s', ASSET_PACK_PATH)
+                return None
+            stale: List[str] = _asset_pack.stale_sources(
+                os.path.join(MAIN_DIR, DATA_FOLDER),
+            )
+            if stale:
+                # images are decoded from data/ until the pack is rebuilt
+                logger.warning(
+                    'Asset pack %s is older than %s, ignored;'
+                    ' rebuild it with python -m utils.build_asset_pack',
+                    ASSET_PACK_PATH,
+                    ', '.join(stale),
+                )
+                _asset_pack.close()
+                _asset_pack = None
+            else:
+                logger.info(
+                    'Asset pack %s: %d images', ASSET_PACK_PATH, len(_asset_pack),
+                )
+    return _asset_pack
+
+
+def decode_image(
+        name: str, size: Optional[Tuple[int, int]] = None,
+) -> pygame.Surface:
+    # name is relative to the data folder; the surface is not converted
+    pack: Optional[AssetPack] = get_asset_pack()
+    if pack is not None:
+        surface: Optional[pygame.Surface] = pack.get(asset_key(name, size))
+        if surface is not None:
+            return surface
+    surface = pygame.image.load(os.path.join(MAIN_DIR, DATA_FOLDER, name))
+    if size is not None:
+        surface = pygame.transform.scale(surface, size)
+    return surface
+
+
+def load_image(
+        name: str, size: Optional[Tuple[int, int]] = None, alpha: bool = False,
+) -> pygame.Surface:
+    pack: Optional[AssetPack] = get_asset_pack()
+    if alpha and pack is not None and asset_key(name, size) in pack:
+        # packed pixels have per-pixel alpha, blitted without a copy
+        return pack.get(asset_key(name, size))
+    surface: pygame.Surface = decode_image(name, size)
+    return surface.convert_alpha() if alpha else surface.convert()
@@ -1,42 +1,178 @@
+import logging
 import os
+import threading
+from collections import OrderedDict
+from queue import Empty, Queue
+from typing import List, Optional, Set, Tuple
+
 import pygame
-from typing import List
-from settings import DATA_FOLDER, SCREEN_RESOLUTION, MAIN_DIR
+
+from images.asset_pack import decode_image, get_asset_pack
+from settings import (
+    BACKGROUND_ANIMATED,
+    BACKGROUND_CACHE_SIZE,
+    BACKGROUND_FRAME_DURATION,
+    BACKGROUND_PREFETCH,
+    DATA_FOLDER,
+    MAIN_DIR,
+    SCREEN_RESOLUTION,
+)
+from utils.gifextract import load_frames
+
+logger = logging.getLogger(__name__)
 
 
 class Background:
-    def __init__(self, background_dir):
-        self.images: List = []
+    # frames are decoded on demand and kept in a bounded LRU cache; a worker
+    # thread decodes the next `prefetch` frames ahead of the animation.
+    # background_dir is a folder of extracted PNG frames or a GIF file.
+    def __init__(
+            self,
+            background_dir,
+            frame_duration: int = BACKGROUND_FRAME_DURATION,
+            animated: bool = BACKGROUND_ANIMATED,
+            cache_size: int = BACKGROUND_CACHE_SIZE,
+            prefetch: int = BACKGROUND_PREFETCH,
+    ):
         background_path: str = os.path.join(
             MAIN_DIR, DATA_FOLDER, background_dir,
         )
-        images_files_len: int = len(
-            [
-                file
-                for file in os.listdir(background_path)
-                if os.path.isfile(os.path.join(background_path, file))
-            ],
-        )
-
-        for i in range(images_files_len):
-            file: str = os.path.join(background_path, f'background-{i}.png')
-            self.images.append(
-                pygame.transform.scale(
-                    pygame.image.load(file).convert(), SCREEN_RESOLUTION,
-                ),
+        # unscaled frames of a GIF, kept in memory instead of PNG files
+        self.gif_frames: Optional[List[pygame.Surface]] = None
+        if os.path.isfile(background_path):
+            self.gif_frames = load_frames(background_path)
+            images_files_len: int = len(self.gif_frames)
+        else:
+            images_files_len = len(
+                [
+                    file
+                    for file in os.listdir(background_path)
+                    if os.path.isfile(os.path.join(background_path, file))
+                ],
             )
+        # names relative to the data folder, as used by the asset pack
+        self.files: List[str] = [
+            f'{background_dir}/background-{i}.png'
+            for i in range(images_files_len)
+        ]
+        # open the pack before the prefetch thread can race for it
+        get_asset_pack()
 
         self.counter: int = -1
         self.frame_counter: int = 0
+        self.frame_duration: int = frame_duration
+        self.animated: bool = animated
+        # True when the last __next__ returned another image than before
+        self.frame_changed: bool = True
+        self.current_image: Optional[pygame.Surface] = None
+
+        self.frames: OrderedDict = OrderedDict()
+        self.cache_size: int = max(cache_size, prefetch + 1)
+        self.prefetch: int = prefetch if animated else 0
+        self.hits: int = 0
+        self.misses: int = 0
+
+        # indexes requested from the worker and not collected yet
+        self.pending: Set[int] = set()
+        self.requests: Queue = Queue()
+        self.decoded: Queue = Queue()
+        self.worker: Optional[threading.Thread] = None
+        if self.prefetch:
+            self.worker = threading.Thread(
+                target=self.__prefetch_worker, daemon=True,
+            )
+            self.worker.start()
+
+    def __len__(self) -> int:
+        return len(self.files)
 
     def __iter__(self):
         return self
 
     def __next__(self):
+        self.frame_changed = False
+        if not self.animated:
+            if self.current_image is None:
+                self.current_image = self.get_frame(self.counter)
+            return self.current_image
         self.frame_counter += 1
-        if self.frame_counter == 5:
+        if self.frame_counter >= self.frame_duration:
             self.frame_counter = 0
             self.counter += 1
-            if self.counter == len(self.images):
+            self.frame_changed = True
+            if self.counter == len(self.files):
                 self.counter = 0
-        return self.images[self.counter]
+        if self.frame_changed or self.current_image is None:
+            self.current_image = self.get_frame(self.counter)
+        return self.current_image
+
+    @property
+    def hit_rate(self) -> float:
+        requests: int = self.hits + self.misses
+        return self.hits / requests if requests else 0.0
+
+    def get_frame(self, index: int) -> pygame.Surface:
+        index %= len(self.files)
+        self.__collect_decoded()
+        frame: Optional[pygame.Surface] = self.frames.get(index)
+        if frame is None:
+            self.misses += 1
+            logger.debug('Background frame %d is not prefetched', index)
+            frame = self.__decode(index).convert()
+            self.__store(index, frame)
+        else:
+            self.hits += 1
+            self.frames.move_to_end(index)
+        self.__request_prefetch(index)
+        return frame
+
+    def close(self):
+        if self.worker is not None:
+            self.requests.put(None)
+            self.worker.join()
+            self.worker = None
+        logger.info(
+            'Background cache: %d hits, %d misses (hit rate %.2f)',
+            self.hits,
+            self.misses,
+            self.hit_rate,
+        )
+
+    def __decode(self, index: int) -> pygame.Surface:
+        if self.gif_frames is not None:
+            return pygame.transform.scale(
+                self.gif_frames[index], SCREEN_RESOLUTION,
+            )
+        return decode_image(self.files[index], size=SCREEN_RESOLUTION)
+
+    def __store(self, index: int, frame: pygame.Surface):
+        self.frames[index] = frame
+        self.frames.move_to_end(index)
+        if len(self.frames) > self.cache_size:
+            self.frames.popitem(last=False)
+
+    def __request_prefetch(self, index: int):
+        for offset in range(1, self.prefetch + 1):
+            next_index: int = (index + offset) % len(self.files)
+            if next_index not in self.frames and next_index not in self.pending:
+                self.pending.add(next_index)
+                self.requests.put(next_index)
+
+    def __collect_decoded(self):
+        # convert() touches the display format, so it runs on the game thread
+        while True:
+            try:
+                decoded: Tuple[int, pygame.Surface] = self.decoded.get_nowait()
+            except Empty:
+                return
+            index, frame = decoded
+            self.pending.discard(index)
+            if index not in self.frames:
+                self.__store(index, frame.convert())
+
+    def __prefetch_worker(self):
+        while True:
+            index: Optional[int] = self.requests.get()
+            if index is None:
+                return
+            self.decoded.put((index, self.__decode(index)))
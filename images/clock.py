@@ -2,17 +2,17 @@ import logging
 import os
 import pygame
 from typing import List, Dict, Tuple
+from images.asset_pack import load_image
 from settings import DATA_FOLDER, MAIN_DIR
 
 logger = logging.getLogger(__name__)
 
+CLOCK_FRAME_SIZE = (200, 130)
+
 
 class ClockFrame:
     def __init__(self, filename):
-        path = os.path.join(MAIN_DIR, DATA_FOLDER, filename)
-        self.image = pygame.transform.scale(
-            pygame.image.load(path).convert(), (200, 130),
-        )
+        self.image = load_image(filename, size=CLOCK_FRAME_SIZE)
         self.position = (440, 290)
 
 
@@ -22,13 +22,13 @@ class ClockFace:
         digits_path = os.path.join(MAIN_DIR, DATA_FOLDER, digits_dir)
         digits_files = sorted(
             [
-                os.path.join(digits_path, file)
+                f'{digits_dir}/{file}'
                 for file in os.listdir(digits_path)
                 if os.path.isfile(os.path.join(digits_path, file))
             ],
         )
         digits_images: List[pygame.Surface] = [
-            pygame.image.load(file).convert_alpha() for file in digits_files
+            load_image(file, alpha=True) for file in digits_files
         ]
         self.digits: Dict = dict(zip([x for x in range(10)], digits_images))
         logger.debug('digits collection: %s', self.digits)
@@ -36,6 +36,9 @@ class ClockFace:
     def add_points(self, points: int):
         self.points_int += points
 
+    def set_points(self, points: int):
+        self.points_int = points
+
     def reset_points(self):
         self.points_int = 0
 
@@ -1,6 +1,4 @@
-import os
-import pygame
-from settings import DATA_FOLDER, MAIN_DIR
+from images.asset_pack import load_image
 
 
 class Image:
@@ -8,8 +6,7 @@ class Image:
         self.image = None
 
     def load_image(self, name):
-        path = os.path.join(MAIN_DIR, DATA_FOLDER, name)
-        self.image = pygame.image.load(path).convert()
+        self.image = load_image(name)
 
 
 class PointImage(Image):
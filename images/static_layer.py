@@ -0,0 +1,26 @@
+from typing import Callable, Tuple
+
+import pygame
+
+TRANSPARENT_COLOR = (255, 0, 255)
+
+
+class StaticLayer:
+    # screen-sized surface with rarely changing parts of the frame, rebuilt
+    # only when the key describing its inputs changes; TRANSPARENT_COLOR is
+    # the colorkey, so blitting it over the background is one cheap blit
+    def __init__(self, size: Tuple[int, int]):
+        self.surface: pygame.Surface = pygame.Surface(size).convert()
+        self.surface.set_colorkey(TRANSPARENT_COLOR, pygame.RLEACCEL)
+        self.key: Tuple = None
+        self.rebuilds: int = 0
+
+    def get(
+            self, key: Tuple, builder: Callable[[pygame.Surface], None],
+    ) -> pygame.Surface:
+        if key != self.key:
+            self.surface.fill(TRANSPARENT_COLOR)
+            builder(self.surface)
+            self.key = key
+            self.rebuilds += 1
+        return self.surface
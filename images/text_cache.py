@@ -0,0 +1,41 @@
+from collections import OrderedDict
+from typing import Tuple
+
+import pygame
+
+from settings import TEXT_CACHE_SIZE
+
+
+class TextRenderCache:
+    # rendered text surfaces keyed by (text, font, antialias, colors),
+    # the least recently used surface is dropped when the cache is full
+    def __init__(self, max_size: int = TEXT_CACHE_SIZE):
+        self.max_size: int = max_size
+        self.__surfaces: OrderedDict = OrderedDict()
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def __len__(self) -> int:
+        return len(self.__surfaces)
+
+    def render(
+            self,
+            font: pygame.font.Font,
+            text: str,
+            antialias: bool,
+            text_color: Tuple,
+            background_color: Tuple = None,
+    ) -> pygame.Surface:
+        key: Tuple = (text, font, antialias, text_color, background_color)
+        surface: pygame.Surface = self.__surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.__surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, antialias, text_color, background_color)
+        self.__surfaces[key] = surface
+        if len(self.__surfaces) > self.max_size:
+            self.__surfaces.popitem(last=False)
+        return surface
@@ -2,10 +2,13 @@ import logging
 import os
 import datetime
 import getpass
+from logging.handlers import QueueListener
 
 from game_level import GameLevel
+from scores.journal import JournalReader
 from scores.scores import CSVReader, Scores, GoogleSheetsReader
 from settings import LOG_LEVEL
+from tracing import setup_logging, trace
 
 logger = logging.getLogger(__name__)
 
@@ -15,26 +18,40 @@ def main():
     logs_dir: str = os.path.join(root_dir, 'logs')
     if not os.path.exists(logs_dir):
         os.makedirs(logs_dir)
+    replays_dir: str = os.path.join(root_dir, 'replays')
+    if not os.path.exists(replays_dir):
+        os.makedirs(replays_dir)
     log_filename: str = datetime.datetime.utcnow().isoformat().replace(
         '-', '',
     ).replace(':', '')[:15]
-    logging.basicConfig(
+    log_listener: QueueListener = setup_logging(
         filename=os.path.join(logs_dir, f'{log_filename}.log'),
         level=getattr(logging, LOG_LEVEL),
-        format='%(asctime)s - %(levelname)s - %(filename)s.%(funcName)s: %(message)s',
     )
 
     current_user: str = getpass.getuser()
 
     # csv_reader: CSVReader = CSVReader(root_dir)
     # scores: Scores = Scores(csv_reader)
+    # journal_reader: JournalReader = JournalReader(root_dir)
+    # scores: Scores = Scores(journal_reader)
     google_sheet_reader: GoogleSheetsReader = GoogleSheetsReader()
     scores: Scores = Scores(google_sheet_reader)
-    game: GameLevel = GameLevel(current_user=current_user, scores=scores)
-    while game.update_field():
-        pass
-
-    scores.rewrite()
+    try:
+        game: GameLevel = GameLevel(
+            current_user=current_user, scores=scores, replay_dir=replays_dir,
+        )
+        while game.update_field():
+            pass
+
+        scores.rewrite()
+    except Exception:
+        logger.exception('Game crashed!')
+        trace.dump(logger)
+        raise
+    finally:
+        scores.close()
+        log_listener.stop()
 
 
 if __name__ == '__main__':
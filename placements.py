@@ -0,0 +1,120 @@
+from collections import deque
+from typing import Deque, Dict, List, NamedTuple, Optional, Tuple
+
+from field import Field
+from figures_templates import Shape, shapes
+
+# Finds every final resting position of a figure reachable with the moves
+# of the game: horizontal shifts, rotations along the figure sequence and
+# gravity. States (figure_id, x, y) are explored by BFS, a state where
+# gravity is blocked is a placement.
+
+MAX_SHAPE_HEIGHT = max(shape.y_size for shape in shapes)
+
+
+class Placement(NamedTuple):
+    figure_id: int  # rotation of the figure at rest
+    x: int
+    y: int
+    rows: Tuple[int, ...]  # resulting stable rows, full rows removed
+    lines_cleared: int
+
+
+def enumerate_placements(
+        field: Field,
+        figure_id: int,
+        start_x: Optional[int] = None,
+        start_y: int = -1,
+) -> List[Placement]:
+    stable_rows: List[int] = field.stable_rows
+    x_size: int = field.x_size
+    y_size: int = field.y_size
+    if start_x is None:
+        start_x = (x_size - shapes[figure_id].x_size) // 2
+
+    fits_cache: Dict[Tuple[int, int, int], bool] = {}
+
+    def fits(state: Tuple[int, int, int]) -> bool:
+        shape_id, pos_x, pos_y = state
+        shape: Shape = shapes[shape_id]
+        result: bool = (
+            0 <= pos_x <= x_size - shape.x_size
+            and pos_y + shape.y_size <= y_size
+        )
+        if result:
+            for mask in shape.row_masks:
+                if pos_y >= 0 and stable_rows[pos_y] & (mask << pos_x):
+                    result = False
+                    break
+                pos_y += 1
+        fits_cache[state] = result
+        return result
+
+    start: Tuple[int, int, int] = (figure_id, start_x, start_y)
+    if not fits(start):
+        return []
+
+    # rows above the highest frozen cell are empty: every rotation at every
+    # column is reachable there, so BFS starts right above the stack
+    stack_top: int = next(
+        (y for y, row in enumerate(stable_rows) if row), y_size,
+    )
+    free_fall_y: int = stack_top - MAX_SHAPE_HEIGHT
+    queue: Deque[Tuple[int, int, int]]
+    if free_fall_y > start_y:
+        queue = deque(
+            (shape_id, pos_x, free_fall_y)
+            for shape_id in rotations(figure_id)
+            for pos_x in range(x_size - shapes[shape_id].x_size + 1)
+        )
+    else:
+        queue = deque([start])
+    visited = set(queue)
+    placements: List[Placement] = []
+    while queue:
+        shape_id, pos_x, pos_y = queue.popleft()
+        for next_state in (
+                (shape_id, pos_x, pos_y + 1),
+                (shape_id, pos_x - 1, pos_y),
+                (shape_id, pos_x + 1, pos_y),
+                (shapes[shape_id].next_id, pos_x, pos_y),
+        ):
+            if next_state in visited:
+                continue
+            next_fits: Optional[bool] = fits_cache.get(next_state)
+            if next_fits is None:
+                next_fits = fits(next_state)
+            if next_fits:
+                visited.add(next_state)
+                queue.append(next_state)
+            elif next_state[2] != pos_y:
+                # gravity is blocked: the figure rests here
+                placements.append(
+                    make_placement(field, shape_id, pos_x, pos_y),
+                )
+    return placements
+
+
+def rotations(figure_id: int) -> List[int]:
+    shape_ids: List[int] = [figure_id]
+    while shapes[shape_ids[-1]].next_id != figure_id:
+        shape_ids.append(shapes[shape_ids[-1]].next_id)
+    return shape_ids
+
+
+def make_placement(
+        field: Field, figure_id: int, pos_x: int, pos_y: int,
+) -> Placement:
+    rows: List[int] = list(field.stable_rows)
+    for fig_y, mask in enumerate(shapes[figure_id].row_masks):
+        if pos_y + fig_y >= 0:
+            rows[pos_y + fig_y] |= mask << pos_x
+    kept_rows: List[int] = [row for row in rows if row != field.full_row_mask]
+    lines_cleared: int = len(rows) - len(kept_rows)
+    return Placement(
+        figure_id=figure_id,
+        x=pos_x,
+        y=pos_y,
+        rows=(0,) * lines_cleared + tuple(kept_rows),
+        lines_cleared=lines_cleared,
+    )
@@ -0,0 +1,102 @@
+import json
+import os
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+from settings import PROFILER_ENABLED, PROFILER_TRACE_SIZE, PROFILER_WINDOW
+
+PERCENTILES = (50, 95, 99)
+
+
+class Phase:
+    # context manager timing one phase of a frame; a no-op while the
+    # profiler is disabled
+    def __init__(self, profiler: 'FrameProfiler', name: str):
+        self.profiler: FrameProfiler = profiler
+        self.name: str = name
+        self.started: Optional[float] = None
+
+    def __enter__(self):
+        if self.profiler.enabled:
+            self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        if self.started is not None:
+            self.profiler.record(
+                self.name, self.started, time.perf_counter() - self.started,
+            )
+            self.started = None
+
+
+class FrameProfiler:
+    # rolling windows of the last `window` durations of every phase, and
+    # the last `trace_size` phases as Chrome trace events
+    def __init__(
+            self,
+            window: int = PROFILER_WINDOW,
+            trace_size: int = PROFILER_TRACE_SIZE,
+            enabled: bool = PROFILER_ENABLED,
+    ):
+        self.enabled: bool = enabled
+        self.window: int = window
+        self.phases: Dict[str, Phase] = {}
+        self.samples: Dict[str, Deque[float]] = {}
+        self.events: Deque[Tuple[str, float, float]] = deque(
+            maxlen=trace_size,
+        )
+
+    def phase(self, name: str) -> Phase:
+        phase: Optional[Phase] = self.phases.get(name)
+        if phase is None:
+            phase = self.phases[name] = Phase(self, name)
+        return phase
+
+    def record(self, name: str, started: float, duration: float):
+        samples: Optional[Deque[float]] = self.samples.get(name)
+        if samples is None:
+            samples = self.samples[name] = deque(maxlen=self.window)
+        samples.append(duration)
+        self.events.append((name, started, duration))
+
+    def clear(self):
+        self.samples.clear()
+        self.events.clear()
+
+    def percentiles(self, name: str) -> Tuple[float, ...]:
+        # nearest-rank percentiles of the window, in seconds
+        samples: List[float] = sorted(self.samples.get(name, ()))
+        if not samples:
+            return tuple(0.0 for _ in PERCENTILES)
+        return tuple(
+            samples[min(len(samples) - 1, len(samples) * percent // 100)]
+            for percent in PERCENTILES
+        )
+
+    def summary(self) -> List[Tuple[str, Tuple[float, ...]]]:
+        return [
+            (name, self.percentiles(name)) for name in sorted(self.samples)
+        ]
+
+    def chrome_trace(self) -> Dict:
+        # complete ("X") events in microseconds, nested by their time spans;
+        # load the file in chrome://tracing or Perfetto
+        return {
+            'traceEvents': [
+                {
+                    'name': name,
+                    'ph': 'X',
+                    'ts': started * 1e6,
+                    'dur': duration * 1e6,
+                    'pid': os.getpid(),
+                    'tid': 1,
+                }
+                for name, started, duration in self.events
+            ],
+            'displayTimeUnit': 'ms',
+        }
+
+    def export_chrome_trace(self, filename: str):
+        with open(filename, 'w') as trace_file:
+            json.dump(self.chrome_trace(), trace_file)
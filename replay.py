@@ -0,0 +1,188 @@
+import argparse
+import random
+import struct
+import time
+from typing import List, Optional, Tuple
+
+from game_core import Action, GameCore, GameState
+
+# Replay layout: header, then one event per input:
+#     varint(ticks since the previous event), action byte
+# The last event has the TICK action and marks the tick the game ended at.
+# Figures and their spawn positions are not stored, GameCore draws them from
+# a generator seeded with the recorded seed.
+REPLAY_MAGIC = b'CRRP'
+REPLAY_VERSION = 1
+# magic, version, seed, field_v_size, field_h_size
+REPLAY_HEADER = struct.Struct('<4sBQHH')
+END_OF_REPLAY = Action.TICK  # never recorded as an input
+
+ReplayEvent = Tuple[int, Action]  # (ticks before the action, action)
+
+
+def new_seed() -> int:
+    return random.getrandbits(64)
+
+
+def write_varint(buffer: bytearray, value: int):
+    while value >= 0x80:
+        buffer.append(value & 0x7f | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+
+def read_varint(data: bytes, offset: int) -> Tuple[int, int]:
+    value: int = 0
+    shift: int = 0
+    while True:
+        byte: int = data[offset]
+        offset += 1
+        value |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+
+class Replay:
+    def __init__(
+            self,
+            seed: int,
+            field_v_size: int = 20,
+            field_h_size: int = 10,
+            events: Optional[List[ReplayEvent]] = None,
+            end_tick: int = 0,
+    ):
+        self.seed: int = seed
+        self.field_v_size: int = field_v_size
+        self.field_h_size: int = field_h_size
+        self.events: List[ReplayEvent] = events or []
+        self.end_tick: int = end_tick
+
+    def new_core(self) -> GameCore:
+        return GameCore(self.field_v_size, self.field_h_size, seed=self.seed)
+
+    def record(self, ticks: int, action: Action):
+        self.events.append((ticks, action))
+        self.end_tick = ticks
+
+    def finish(self, ticks: int):
+        self.end_tick = ticks
+
+    def to_bytes(self) -> bytes:
+        data: bytearray = bytearray(
+            REPLAY_HEADER.pack(
+                REPLAY_MAGIC,
+                REPLAY_VERSION,
+                self.seed,
+                self.field_v_size,
+                self.field_h_size,
+            ),
+        )
+        last_tick: int = 0
+        for ticks, action in self.events:
+            write_varint(data, ticks - last_tick)
+            data.append(action.value)
+            last_tick = ticks
+        write_varint(data, self.end_tick - last_tick)
+        data.append(END_OF_REPLAY.value)
+        return bytes(data)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'Replay':
+        magic, version, seed, field_v_size, field_h_size = (
+            REPLAY_HEADER.unpack_from(data)
+        )
+        if magic != REPLAY_MAGIC or version != REPLAY_VERSION:
+            raise ValueError(f'Not a version {REPLAY_VERSION} replay')
+        replay: Replay = cls(seed, field_v_size, field_h_size)
+        offset: int = REPLAY_HEADER.size
+        ticks: int = 0
+        while True:
+            delta, offset = read_varint(data, offset)
+            ticks += delta
+            action: Action = Action(data[offset])
+            offset += 1
+            if action == END_OF_REPLAY:
+                replay.finish(ticks)
+                return replay
+            replay.events.append((ticks, action))
+
+    def save(self, filename: str):
+        with open(filename, 'wb') as replay_file:
+            replay_file.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, filename: str) -> 'Replay':
+        with open(filename, 'rb') as replay_file:
+            return cls.from_bytes(replay_file.read())
+
+
+class ReplayPlayer:
+    # drives a GameCore with the recorded inputs, one logic tick per step()
+    def __init__(self, replay: Replay):
+        self.replay: Replay = replay
+        self.core: GameCore = replay.new_core()
+        self.next_event: int = 0
+
+    @property
+    def finished(self) -> bool:
+        return self.core.game_over or self.core.ticks >= self.replay.end_tick
+
+    def step(self) -> GameState:
+        # inputs are applied between ticks, as in GameLevel
+        events: List[ReplayEvent] = self.replay.events
+        while (
+                self.next_event < len(events)
+                and events[self.next_event][0] <= self.core.ticks
+        ):
+            self.core.step(events[self.next_event][1])
+            self.next_event += 1
+        return self.core.step(Action.TICK)
+
+    def run(self) -> GameState:
+        # fast-forward without rendering
+        while not self.finished:
+            self.step()
+        return self.core.last_state
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Play a recorded game')
+    parser.add_argument('replay')
+    parser.add_argument(
+        '--render',
+        action='store_true',
+        help='show the game instead of fast-forwarding it headlessly',
+    )
+    parser.add_argument(
+        '--speed', type=float, default=1.0, help='playback speed when rendering',
+    )
+    args = parser.parse_args()
+
+    replay: Replay = Replay.load(args.replay)
+    if args.render:
+        # pygame is only needed to watch the replay
+        from game_level import GameLevel
+
+        game: GameLevel = GameLevel(
+            current_user='replay',
+            scores=None,
+            replay=replay,
+            replay_speed=args.speed,
+        )
+        while game.update_field():
+            pass
+        return
+
+    started: float = time.perf_counter()
+    state: GameState = ReplayPlayer(replay).run()
+    elapsed: float = time.perf_counter() - started
+    print(
+        f'{state.ticks} ticks, {state.pieces} pieces, {state.points} points,'
+        f' game over: {state.game_over_reason}'
+        f' ({elapsed:.3f}s, {state.ticks / max(elapsed, 1e-9):.0f} ticks/s)',
+    )
+
+
+if __name__ == '__main__':
+    main()
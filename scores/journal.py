@@ -0,0 +1,253 @@
+import csv
+import json
+import logging
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from scores.scores import (
+    AbstractReader,
+    Leaderboard,
+    ScoresTable,
+    is_frame_duplicate,
+    parse_rows,
+)
+from settings import JOURNAL_COMPACT_THRESHOLD, LEADERBOARD_SIZE
+
+logger = logging.getLogger(__name__)
+
+# Files in root_dir:
+#   scores.journal    - records appended since the last compaction
+#   scores.journal.N  - journals frozen by compaction N, the full history
+#   scores.index      - per-user best and global top, folded up to segment N
+#   scores.dat        - legacy CSVReader file, imported once when there is
+#                       no index yet
+JOURNAL_FILE = 'scores.journal'
+INDEX_FILE = 'scores.index'
+LEGACY_FILE = 'scores.dat'
+INDEX_VERSION = 2
+
+Record = Tuple[int, str, str]
+Row = Tuple  # a record and its session id, if it has one
+
+
+class ScoresIndex:
+    def __init__(self, top_size: int = LEADERBOARD_SIZE):
+        self.segment: int = 0  # last journal segment folded into the index
+        self.records: int = 0
+        self.user_best: Dict[str, Row] = {}
+        self.top: Leaderboard = Leaderboard(top_size)
+        self.last_legacy_record: Optional[Record] = None
+
+    def add(self, row: Row):
+        if len(row) < 4 or not row[3]:
+            # same collapsing of per-frame duplicates as in ScoresTable
+            duplicate: bool = is_frame_duplicate(self.last_legacy_record, row)
+            self.last_legacy_record = row[:3]
+            if duplicate:
+                return
+            # a unique id keeps equal old records apart in the stored top
+            row = (*row[:3], f'legacy-{self.records}')
+        else:
+            self.last_legacy_record = None
+        self.records += 1
+        best: Optional[Row] = self.user_best.get(row[1])
+        if best is None or row[0] > best[0]:
+            self.user_best[row[1]] = row
+        self.top.add(row)
+
+    def to_json(self) -> Dict:
+        return {
+            'version': INDEX_VERSION,
+            'segment': self.segment,
+            'records': self.records,
+            'user_best': list(self.user_best.values()),
+            'top': self.top.get_top(self.top.size),
+        }
+
+    @classmethod
+    def from_json(cls, data: Dict, top_size: int) -> 'ScoresIndex':
+        index: ScoresIndex = cls(top_size)
+        index.segment = data['segment']
+        index.records = data['records']
+        index.user_best = {row[1]: tuple(row) for row in data['user_best']}
+        for row in data['top']:
+            index.top.add(tuple(row))
+        return index
+
+
+class JournalReader(AbstractReader):
+    # Appends new records instead of rewriting the whole file. Startup reads
+    # the index and the journals not compacted yet, not the full history.
+    def __init__(
+            self,
+            root_dir: str,
+            compact_threshold: int = JOURNAL_COMPACT_THRESHOLD,
+            top_size: int = LEADERBOARD_SIZE,
+    ):
+        self.root_dir: str = root_dir
+        self.journal_filename: str = os.path.join(root_dir, JOURNAL_FILE)
+        self.index_filename: str = os.path.join(root_dir, INDEX_FILE)
+        self.compact_threshold: int = compact_threshold
+        self.top_size: int = top_size
+
+        self.index: ScoresIndex = ScoresIndex(top_size)
+        # records appended to journals that are not in the index yet
+        self.pending_records: int = 0
+        self.last_segment: int = 0
+        # guards journal files and the index against the compaction thread
+        self.lock: threading.Lock = threading.Lock()
+        self.compaction: Optional[threading.Thread] = None
+
+    def read(self) -> ScoresTable:
+        with self.lock:
+            self.index = self.__load_index()
+            scores_table: ScoresTable = ScoresTable()
+            for row in self.index.top.get_top(self.top_size):
+                scores_table.add_record(*row)
+
+            self.last_segment = self.index.segment
+            self.pending_records = 0
+            for segment in self.__segments_after(self.index.segment):
+                self.last_segment = segment
+                self.pending_records += self.__add_records(
+                    self.__segment_filename(segment), scores_table,
+                )
+            self.pending_records += self.__add_records(
+                self.journal_filename, scores_table,
+            )
+        scores_table.mark_synced()
+        return scores_table
+
+    def rewrite(self, scores_table: ScoresTable):
+        records: List[Row] = scores_table.get_unsynced()
+        if not records:
+            return
+        with self.lock:
+            # one write and one fsync for the whole batch of new records
+            torn_line: bool = self.__has_torn_line()
+            with open(self.journal_filename, 'a', newline='') as journal:
+                if torn_line:
+                    # keep a record cut by a crash off the new first line
+                    journal.write('\n')
+                csv.writer(journal, delimiter=',').writerows(records)
+                journal.flush()
+                os.fsync(journal.fileno())
+            self.pending_records += len(records)
+        scores_table.mark_synced()
+        if self.pending_records >= self.compact_threshold:
+            self.start_compaction()
+
+    def get_user_best(self, username: str) -> Optional[Record]:
+        best: Optional[Row] = self.index.user_best.get(username)
+        return best[:3] if best is not None else None
+
+    def start_compaction(self):
+        if self.compaction is not None and self.compaction.is_alive():
+            return
+        self.compaction = threading.Thread(target=self.compact, daemon=True)
+        self.compaction.start()
+
+    def wait_for_compaction(self):
+        if self.compaction is not None:
+            self.compaction.join()
+            self.compaction = None
+
+    def compact(self):
+        # the active journal is frozen as the next segment, new records go
+        # to a fresh journal while the index is rebuilt without the lock
+        with self.lock:
+            if os.path.exists(self.journal_filename):
+                self.last_segment += 1
+                os.replace(
+                    self.journal_filename,
+                    self.__segment_filename(self.last_segment),
+                )
+            last_segment: int = self.last_segment
+            index: ScoresIndex = ScoresIndex.from_json(
+                self.index.to_json(), self.top_size,
+            )
+            folded_records: int = self.pending_records
+
+        for segment in self.__segments_after(index.segment):
+            if segment > last_segment:
+                break
+            for record in self.__read_records(self.__segment_filename(segment)):
+                index.add(record)
+            index.segment = segment
+        self.__write_index(index)
+
+        with self.lock:
+            self.index = index
+            # records appended while the index was rebuilt stay pending
+            self.pending_records -= folded_records
+        logger.info(
+            'Scores journal compacted up to segment %d, %d records',
+            index.segment,
+            index.records,
+        )
+
+    def __load_index(self) -> ScoresIndex:
+        if os.path.exists(self.index_filename):
+            with open(self.index_filename) as index_file:
+                data: Dict = json.load(index_file)
+            if data.get('version') == INDEX_VERSION:
+                return ScoresIndex.from_json(data, self.top_size)
+            logger.warning('Unknown scores index version, rebuilding it')
+
+        index: ScoresIndex = ScoresIndex(self.top_size)
+        legacy_filename: str = os.path.join(self.root_dir, LEGACY_FILE)
+        if os.path.exists(legacy_filename):
+            for record in self.__read_records(legacy_filename):
+                index.add(record)
+        for segment in self.__segments_after(0):
+            for record in self.__read_records(self.__segment_filename(segment)):
+                index.add(record)
+            index.segment = segment
+        self.__write_index(index)
+        return index
+
+    def __write_index(self, index: ScoresIndex):
+        # readers never see a half-written index
+        temp_filename: str = f'{self.index_filename}.tmp'
+        with open(temp_filename, 'w') as index_file:
+            json.dump(index.to_json(), index_file)
+            index_file.flush()
+            os.fsync(index_file.fileno())
+        os.replace(temp_filename, self.index_filename)
+
+    def __add_records(self, filename: str, scores_table: ScoresTable) -> int:
+        records: List[Row] = self.__read_records(filename)
+        for record in records:
+            scores_table.add_record(*record)
+        return len(records)
+
+    def __has_torn_line(self) -> bool:
+        if not os.path.exists(self.journal_filename):
+            return False
+        with open(self.journal_filename, 'rb') as journal:
+            journal.seek(0, os.SEEK_END)
+            if journal.tell() == 0:
+                return False
+            journal.seek(-1, os.SEEK_END)
+            return journal.read(1) != b'\n'
+
+    def __segment_filename(self, segment: int) -> str:
+        return f'{self.journal_filename}.{segment}'
+
+    def __segments_after(self, segment: int) -> List[int]:
+        prefix: str = f'{JOURNAL_FILE}.'
+        segments: List[int] = [
+            int(file[len(prefix):])
+            for file in os.listdir(self.root_dir)
+            if file.startswith(prefix) and file[len(prefix):].isdigit()
+        ]
+        return sorted(number for number in segments if number > segment)
+
+    @staticmethod
+    def __read_records(filename: str) -> List[Row]:
+        if not os.path.exists(filename):
+            return []
+        with open(filename, newline='') as records_file:
+            # a torn last line after a crash is skipped as a broken row
+            return parse_rows(csv.reader(records_file, delimiter=','))
@@ -1,12 +1,38 @@
+import bisect
 import csv
 import logging
 import os
+import threading
 import httplib2
 from abc import abstractmethod
-from typing import List, Tuple, IO
+from datetime import datetime
+from queue import Queue
+from typing import (
+    Callable,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    IO,
+    Union,
+)
 from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
 from oauth2client.service_account import ServiceAccountCredentials
 
+from settings import (
+    LEADERBOARD_SIZE,
+    LEGACY_DUPLICATE_SECONDS,
+    MAIN_DIR,
+    SHEETS_CLOSE_TIMEOUT,
+    SHEETS_OUTBOX_FILE,
+    SHEETS_READ_CHUNK_SIZE,
+    SHEETS_RETRY_DELAYS,
+    SHEETS_SNAPSHOT_FILE,
+)
+
 SCOPES = [
     'https://www.googleapis.com/auth/spreadsheets',
     'https://www.googleapis.com/auth/drive',
@@ -14,22 +40,150 @@ SCOPES = [
 
 CREDENTIALS_FILE = 'credentials.json'
 SPREADSHEET_ID = '19TJRdBdZvyJeD1HkNU1Xx5qZnDUq0US1nMDKmsQQeG0'
+SHEETS_SHEET = 'score'
 
 logger = logging.getLogger(__name__)
 
 
+def parse_rows(rows: Iterable[List]) -> List[Tuple]:
+    # (points, username, timestamp[, session_id]); broken rows are skipped
+    return [
+        (int(row[0]), *row[1:4])
+        for row in rows
+        if 3 <= len(row) <= 4 and str(row[0]).lstrip('-').isdigit()
+    ]
+
+
+def is_frame_duplicate(previous: Optional[Tuple], record: Tuple) -> bool:
+    # old game versions saved the result of a game on every frame of the
+    # scores screen: the same points and user, seconds apart. Equal results
+    # of separate games are further apart and are kept.
+    if previous is None or previous[:2] != record[:2]:
+        return False
+    try:
+        delta: float = (
+            datetime.fromisoformat(record[2])
+            - datetime.fromisoformat(previous[2])
+        ).total_seconds()
+    except (TypeError, ValueError):
+        return previous[2] == record[2]
+    return abs(delta) <= LEGACY_DUPLICATE_SECONDS
+
+
+class Leaderboard:
+    def __init__(self, size: int = LEADERBOARD_SIZE):
+        self.size: int = size
+        self.added: int = 0
+        # best records sorted by (-points, order of adding), so equal scores
+        # keep the order they were added in
+        self.__records: List[Tuple[int, int, Tuple[int, str, str]]] = []
+
+    def add(self, record: Tuple[int, str, str]):
+        self.added += 1
+        key: Tuple[int, int, Tuple[int, str, str]] = (
+            -record[0], self.added, record,
+        )
+        if len(self.__records) == self.size and key >= self.__records[-1]:
+            return
+        bisect.insort(self.__records, key)
+        if len(self.__records) > self.size:
+            self.__records.pop()
+
+    def get_top(self, count: int) -> List[Tuple[int, str, str]]:
+        return [record for _, _, record in self.__records[:count]]
+
+
 class ScoresTable:
-    def __init__(self):
+    # used by the game thread and by the GoogleSheetsReader worker, every
+    # method holds the lock
+    def __init__(self, leaderboard_size: int = LEADERBOARD_SIZE):
+        self.lock: threading.RLock = threading.RLock()
         self.__scores: List[Tuple[int, str, str]] = []
+        # game session of every record, '' for records saved before sessions
+        self.__session_ids: List[str] = []
+        self.__sessions: Set[Tuple[str, str]] = set()
+        self.__leaderboard: Leaderboard = Leaderboard(leaderboard_size)
+        # last record without a session id, while no session record followed
+        self.__last_legacy_record: Optional[Tuple[int, str, str]] = None
+        # records before this position are already saved by the reader
+        self.__synced_count: int = 0
 
     def __len__(self) -> int:
-        return len(self.__scores)
+        with self.lock:
+            return len(self.__scores)
 
-    def add_record(self, points: int, username: str, timestamp: str):
-        self.__scores.append((points, username, timestamp))
+    # returns False if the record is a duplicate and was skipped
+    def add_record(
+            self,
+            points: Union[int, str],
+            username: str,
+            timestamp: str,
+            session_id: str = '',
+    ) -> bool:
+        # Google Sheets returns strings, points are parsed once here
+        record: Tuple[int, str, str] = (int(points), username, timestamp)
+        with self.lock:
+            if session_id:
+                if (username, session_id) in self.__sessions:
+                    return False
+                self.__sessions.add((username, session_id))
+                self.__last_legacy_record = None
+            else:
+                # a run of frame duplicates is collapsed to its first record
+                duplicate: bool = is_frame_duplicate(
+                    self.__last_legacy_record, record,
+                )
+                self.__last_legacy_record = record
+                if duplicate:
+                    return False
+            self.__scores.append(record)
+            self.__session_ids.append(session_id)
+            self.__leaderboard.add(record)
+            return True
 
     def get_scores(self) -> List[Tuple[int, str, str]]:
-        return self.__scores
+        # the list is swapped, never changed, by replace_synced
+        with self.lock:
+            return self.__scores
+
+    def get_top(self, count: int) -> List[Tuple[int, str, str]]:
+        with self.lock:
+            return self.__leaderboard.get_top(count)
+
+    # rows to save: the record and its session id, if it has one
+    def get_rows(self, start: int = 0) -> List[Tuple]:
+        with self.lock:
+            return [
+                record + (session_id,) if session_id else record
+                for record, session_id in zip(
+                    self.__scores[start:], self.__session_ids[start:],
+                )
+            ]
+
+    def get_unsynced(self) -> List[Tuple]:
+        with self.lock:
+            return self.get_rows(self.__synced_count)
+
+    def mark_synced(self):
+        with self.lock:
+            self.__synced_count = len(self.__scores)
+
+    def replace_synced(self, rows: Iterable[Tuple]):
+        # swaps in a fresh copy of the saved rows, records added locally
+        # and not saved yet stay at the end
+        fresh_table: ScoresTable = ScoresTable(self.__leaderboard.size)
+        for row in rows:
+            fresh_table.add_record(*row)
+        fresh_table.mark_synced()
+        with self.lock:
+            for row in self.get_unsynced():
+                fresh_table.add_record(*row)
+            self.__synced_count = fresh_table.__synced_count
+            self.__last_legacy_record = fresh_table.__last_legacy_record
+            self.__leaderboard = fresh_table.__leaderboard
+            self.__sessions = fresh_table.__sessions
+            self.__session_ids = fresh_table.__session_ids
+            self.__scores = fresh_table.__scores
 
 
 class AbstractReader:
@@ -41,6 +195,9 @@ class AbstractReader:
     def rewrite(self, scores_table: ScoresTable):
         pass
 
+    def close(self):
+        pass
+
 
 class CSVReader(AbstractReader):
     def __init__(self, root_dir: str):
@@ -54,7 +211,10 @@ class CSVReader(AbstractReader):
             csv_reader = csv.reader(self.scores_file, delimiter=',')
             for row in csv_reader:
                 scores_table.add_record(
-                    points=int(row[0]), username=row[1], timestamp=row[2],
+                    points=int(row[0]),
+                    username=row[1],
+                    timestamp=row[2],
+                    session_id=row[3] if len(row) > 3 else '',
                 )
             self.scores_file.close()
             return scores_table
@@ -63,59 +223,196 @@ class CSVReader(AbstractReader):
     def rewrite(self, scores_table: ScoresTable):
         self.scores_file = open(file=self.scores_filename, mode='w+')
         csv_writer = csv.writer(self.scores_file, delimiter=',')
-        for row in scores_table.get_scores():
+        for row in scores_table.get_rows():
             csv_writer.writerow(row)
         self.scores_file.close()
 
 
+def build_sheets_service():
+    credentials = ServiceAccountCredentials.from_json_keyfile_name(
+        CREDENTIALS_FILE, SCOPES,
+    )
+    http_auth = credentials.authorize(httplib2.Http())
+    return build('sheets', 'v4', http=http_auth)
+
+
 class GoogleSheetsReader(AbstractReader):
-    def __init__(self):
-        self.available = True
-        credentials = ServiceAccountCredentials.from_json_keyfile_name(
-            CREDENTIALS_FILE, SCOPES,
+    # read() returns the local snapshot of the sheet at once; a worker thread
+    # connects, refreshes the snapshot and pushes saved tables with retries.
+    # Tables that are not pushed yet wait in an outbox file, so they survive
+    # restarts while the service is unreachable.
+    def __init__(
+            self,
+            service_factory: Callable = build_sheets_service,
+            cache_dir: str = MAIN_DIR,
+            retry_delays: Sequence[float] = SHEETS_RETRY_DELAYS,
+            read_chunk_size: int = SHEETS_READ_CHUNK_SIZE,
+    ):
+        self.available = False
+        self.service = None
+        self.service_factory: Callable = service_factory
+        self.snapshot_filename: str = os.path.join(
+            cache_dir, SHEETS_SNAPSHOT_FILE,
         )
-        http_auth = credentials.authorize(httplib2.Http())
-        try:
-            self.service = build('sheets', 'v4', http=http_auth)
-        except httplib2.ServerNotFoundError:
-            logger.error('Unable to connect to Google Sheets server!')
-            self.available = False
+        self.outbox_filename: str = os.path.join(cache_dir, SHEETS_OUTBOX_FILE)
+        self.retry_delays: Sequence[float] = retry_delays
+        self.read_chunk_size: int = read_chunk_size
+        # the outbox file is shared by rewrite() and the worker thread
+        self.outbox_lock: threading.Lock = threading.Lock()
+        self.scores_table: Optional[ScoresTable] = None
+
+        self.jobs: Queue = Queue()
+        self.stopping: threading.Event = threading.Event()
+        self.worker: threading.Thread = threading.Thread(
+            target=self.__work, daemon=True,
+        )
+        self.worker.start()
 
     def read(self) -> ScoresTable:
-        scores_table: ScoresTable = ScoresTable()
-        if not self.available:
-            return scores_table
+        self.scores_table = ScoresTable()
+        for record in self.__read_rows(self.snapshot_filename):
+            self.scores_table.add_record(*record)
+        self.scores_table.mark_synced()
+        self.jobs.put(self.__refresh)
+        return self.scores_table
 
-        results = (
-            self.service.spreadsheets()
-            .values()
-            .batchGet(spreadsheetId=SPREADSHEET_ID, ranges='score!A1:C9999')
-            .execute()
-        )
-        sheet_content: List[List] = results['valueRanges'][0]['values']
-        for row in sheet_content:
-            scores_table.add_record(
-                points=row[0], username=row[1], timestamp=row[2],
+    def rewrite(self, scores_table: ScoresTable):
+        # new records are added to the outbox right away, the upload happens
+        # in background
+        with scores_table.lock:
+            # a refresh must not see the records in both the table and the
+            # outbox, or in neither
+            records: List[Tuple] = scores_table.get_unsynced()
+            if not records:
+                return
+            with self.outbox_lock:
+                self.__write_rows(
+                    self.outbox_filename,
+                    self.__read_rows(self.outbox_filename) + records,
+                )
+            scores_table.mark_synced()
+        self.jobs.put(self.__push_outbox)
+
+    def close(self, timeout: float = SHEETS_CLOSE_TIMEOUT):
+        self.jobs.put(None)
+        self.worker.join(timeout)
+        self.stopping.set()
+
+    def __work(self):
+        self.jobs.put(self.__push_outbox)
+        while True:
+            job: Optional[Callable] = self.jobs.get()
+            if job is None:
+                return
+            try:
+                job()
+            except Exception:
+                logger.exception('Google Sheets job failed')
+
+    def __call_with_retries(self, request: Callable):
+        for delay in [*self.retry_delays, None]:
+            try:
+                if self.service is None:
+                    self.service = self.service_factory()
+                    self.available = True
+                return request()
+            except (HttpError, httplib2.HttpLib2Error, OSError) as error:
+                if delay is None or self.stopping.is_set():
+                    raise
+                logger.warning(
+                    'Google Sheets request failed (%s), retry in %.1fs',
+                    error,
+                    delay,
+                )
+                self.stopping.wait(delay)
+
+    def __refresh(self):
+        try:
+            records: List[Tuple] = self.__read_sheet()
+        except (HttpError, httplib2.HttpLib2Error, OSError):
+            logger.error('Unable to connect to Google Sheets server!')
+            return
+        self.__write_rows(self.snapshot_filename, records)
+        if self.scores_table is not None:
+            with self.scores_table.lock, self.outbox_lock:
+                # scores waiting in the outbox are not in the sheet yet
+                outbox: List[Tuple] = self.__read_rows(
+                    self.outbox_filename,
+                )
+                self.scores_table.replace_synced(records + outbox)
+
+    def __read_sheet(self) -> List[Tuple]:
+        # the sheet is read in chunks of rows until a chunk is not full
+        records: List[Tuple] = []
+        first_row: int = 1
+        while True:
+            last_row: int = first_row + self.read_chunk_size - 1
+            results = self.__call_with_retries(
+                lambda: self.service.spreadsheets()
+                .values()
+                .get(
+                    spreadsheetId=SPREADSHEET_ID,
+                    range=f'{SHEETS_SHEET}!A{first_row}:D{last_row}',
+                )
+                .execute(),
             )
-        return scores_table
+            rows: List[List] = results.get('values', [])
+            records.extend(parse_rows(rows))
+            if len(rows) < self.read_chunk_size:
+                return records
+            first_row = last_row + 1
 
-    def rewrite(self, scores_table: ScoresTable):
-        if not self.available:
+    def __push_outbox(self):
+        with self.outbox_lock:
+            records: List[Tuple] = self.__read_rows(
+                self.outbox_filename,
+            )
+        if not records:
+            return
+        try:
+            # only new rows are sent, the sheet is never rewritten
+            self.__call_with_retries(
+                lambda: self.service.spreadsheets()
+                .values()
+                .append(
+                    spreadsheetId=SPREADSHEET_ID,
+                    range=f'{SHEETS_SHEET}!A:D',
+                    valueInputOption='USER_ENTERED',
+                    insertDataOption='INSERT_ROWS',
+                    body={'majorDimension': 'ROWS', 'values': records},
+                )
+                .execute(),
+            )
+        except (HttpError, httplib2.HttpLib2Error, OSError):
+            logger.error('Scores stay in the outbox until the next start')
             return
-        range_sheet: str = f'score!A1:C{len(scores_table)}'
-        self.service.spreadsheets().values().batchUpdate(
-            spreadsheetId=SPREADSHEET_ID,
-            body={
-                'valueInputOption': 'USER_ENTERED',
-                'data': [
-                    {
-                        'range': range_sheet,
-                        'majorDimension': 'ROWS',
-                        'values': scores_table.get_scores(),
-                    },
-                ],
-            },
-        ).execute()
+        with self.outbox_lock:
+            self.__write_rows(
+                self.snapshot_filename,
+                self.__read_rows(self.snapshot_filename) + records,
+            )
+            # rows added to the outbox during the upload stay there
+            remaining: List[Tuple] = self.__read_rows(
+                self.outbox_filename,
+            )[len(records):]
+            if remaining:
+                self.__write_rows(self.outbox_filename, remaining)
+            else:
+                os.remove(self.outbox_filename)
+
+    @staticmethod
+    def __read_rows(filename: str) -> List[Tuple]:
+        if not os.path.exists(filename):
+            return []
+        with open(filename, newline='') as rows_file:
+            return parse_rows(csv.reader(rows_file, delimiter=','))
+
+    @staticmethod
+    def __write_rows(filename: str, records: List[Tuple]):
+        temp_filename: str = f'{filename}.tmp'
+        with open(temp_filename, 'w', newline='') as rows_file:
+            csv.writer(rows_file, delimiter=',').writerows(records)
+        os.replace(temp_filename, filename)
 
 
 class Scores:
@@ -128,5 +425,20 @@ class Scores:
             points=score, username=username, timestamp=timestamp,
         )
 
+    # records the result of a game session once, repeated submissions of
+    # the same session are ignored; returns False for them
+    def submit(
+            self, session_id: str, score: int, username: str, timestamp: str,
+    ) -> bool:
+        return self.scores_table.add_record(
+            points=score,
+            username=username,
+            timestamp=timestamp,
+            session_id=session_id,
+        )
+
     def rewrite(self):
         self.reader.rewrite(self.scores_table)
+
+    def close(self):
+        self.reader.close()
@@ -3,11 +3,39 @@ import os
 SCREEN_RESOLUTION = (640, 480)
 WINDOWS_CAPTION = 'CRINGEtris v.0.1'
 SPEED_LEVELS = [15, 13, 11, 9, 7, 5, 3, 1]
+FIELD_V_SIZE = 20  # rows, boards of thousands of rows and columns work
+FIELD_H_SIZE = 10  # columns
+FIELD_VIEWPORT_SIZE = (200, 400)  # screen pixels left of the field borders
+MIN_CELL_SIZE = 4  # bigger fields scroll instead of shrinking the cells
+MAX_CELL_SIZE = 40  # zoom in limit, the +/- keys zoom
+FIGURES_PREVIEW_SIZE = 3  # upcoming figures planned ahead by the factory
 DATA_FOLDER = 'data'
 MENU_FONT_NAME = 'Arial'
 MENU_FONT_SIZE = 90
 SPEED_LABEL_FONT_SIZE = 36
 SCORES_LABEL_FONT_SIZE = 48
-MAX_FPS = 60
-LOG_LEVEL = 'DEBUG'
+TEXT_CACHE_SIZE = 64
+MAX_FPS = 60  # 0 renders as fast as possible
+LOGIC_TICK_RATE = 60  # game logic ticks per second, independent of MAX_FPS
+MAX_CATCHUP_TICKS = 5  # logic ticks per rendered frame when rendering lags
+BACKGROUND_ANIMATED = True
+BACKGROUND_SOURCE = 'bottle'  # PNG frames folder or a GIF file in data/
+BACKGROUND_FRAME_DURATION = 5  # logic ticks per background image
+BACKGROUND_CACHE_SIZE = 16  # decoded background frames kept in memory
+BACKGROUND_PREFETCH = 8  # frames decoded ahead by the prefetch thread
+ASSET_PACK_FILE = 'assets.pack'  # built by utils/build_asset_pack.py
+LOG_LEVEL = 'INFO'
+LEADERBOARD_SIZE = 5  # best scores kept sorted for the scores screen
+LEGACY_DUPLICATE_SECONDS = 2  # max gap of old per-frame duplicate scores
+SHEETS_SNAPSHOT_FILE = 'scores_sheet.csv'  # last known copy of the sheet
+SHEETS_OUTBOX_FILE = 'scores_outbox.csv'  # scores not uploaded yet
+SHEETS_RETRY_DELAYS = (1, 2, 4, 8, 16)  # seconds between upload attempts
+SHEETS_READ_CHUNK_SIZE = 1000  # rows per request when reading the sheet
+SHEETS_CLOSE_TIMEOUT = 3  # seconds an exiting game waits for the upload
+JOURNAL_COMPACT_THRESHOLD = 1000  # journaled scores folded into the index
+TRACE_RING_SIZE = 1000  # recent game events dumped on crash or game over
+PROFILER_ENABLED = False  # frame phase timings, F3 shows them and enables
+PROFILER_WINDOW = 600  # frames in the rolling p50/p95/p99 of each phase
+PROFILER_TRACE_SIZE = 20000  # last phases exported as a Chrome trace by F4
+PROFILER_OVERLAY_REFRESH = 30  # frames between overlay text updates
 MAIN_DIR = os.path.split(os.path.abspath(__file__))[0]
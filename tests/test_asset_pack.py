@@ -0,0 +1,84 @@
+import os
+
+import pygame
+import pytest
+
+from images.asset_pack import AssetPack, PACK_HEADER, asset_key, write_pack
+from settings import SCREEN_RESOLUTION
+
+
+@pytest.fixture(scope='function')
+def setup_pygame():
+    pygame.init()
+    pygame.display.set_mode(SCREEN_RESOLUTION)
+    yield
+
+
+def test_pack_round_trip(setup_pygame, tmp_path):
+    opaque: pygame.Surface = pygame.Surface((3, 2))
+    opaque.fill((10, 20, 30))
+    opaque.set_at((2, 1), (200, 100, 50))
+    transparent: pygame.Surface = pygame.Surface((2, 2), pygame.SRCALPHA, 32)
+    transparent.fill((1, 2, 3, 128))
+
+    path: str = str(tmp_path / 'assets.pack')
+    write_pack(
+        path,
+        [
+            (asset_key('opaque.png', (3, 2)), opaque),
+            (asset_key('transparent.png'), transparent),
+        ],
+    )
+    pack: AssetPack = AssetPack(path)
+
+    assert len(pack) == 2
+    assert 'opaque.png@3x2' in pack
+    assert pack.get('missing.png') is None
+
+    unpacked: pygame.Surface = pack.get('opaque.png@3x2')
+    assert unpacked.get_size() == (3, 2)
+    assert unpacked.get_at((0, 0)) == (10, 20, 30, 255)
+    assert unpacked.get_at((2, 1)) == (200, 100, 50, 255)
+    assert pack.get('transparent.png').get_at((1, 1)) == (1, 2, 3, 128)
+
+
+def test_not_a_pack(tmp_path):
+    path = tmp_path / 'assets.pack'
+    path.write_bytes(b'PNG' + bytes(32))
+    with pytest.raises(ValueError):
+        AssetPack(str(path))
+
+
+def test_pack_records_pixel_format(setup_pygame, tmp_path):
+    path = tmp_path / 'assets.pack'
+    write_pack(str(path), [('point.png', pygame.Surface((1, 1)))])
+    data: bytearray = bytearray(path.read_bytes())
+    assert data[PACK_HEADER.size - 8:PACK_HEADER.size - 4] == b'RGBA'
+
+    data[PACK_HEADER.size - 8:PACK_HEADER.size - 4] = b'BGRA'
+    path.write_bytes(bytes(data))
+    with pytest.raises(ValueError):
+        AssetPack(str(path))
+
+
+def test_stale_sources(setup_pygame, tmp_path):
+    data_dir = tmp_path / 'data'
+    data_dir.mkdir()
+    (data_dir / 'old.png').write_bytes(b'')
+    (data_dir / 'new.png').write_bytes(b'')
+    path = tmp_path / 'assets.pack'
+    write_pack(
+        str(path),
+        [
+            (asset_key('old.png', (2, 2)), pygame.Surface((2, 2))),
+            (asset_key('new.png'), pygame.Surface((1, 1))),
+            (asset_key('removed.png'), pygame.Surface((1, 1))),
+        ],
+    )
+    built: float = os.path.getmtime(path)
+    os.utime(data_dir / 'old.png', (built - 10, built - 10))
+    os.utime(data_dir / 'new.png', (built + 10, built + 10))
+
+    pack: AssetPack = AssetPack(str(path))
+    assert pack.stale_sources(str(data_dir)) == ['new.png']
+    pack.close()
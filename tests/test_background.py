@@ -0,0 +1,81 @@
+import time
+
+import pygame
+import pytest
+
+from images.background import Background
+from settings import SCREEN_RESOLUTION
+
+
+@pytest.fixture(scope='function')
+def setup_pygame():
+    pygame.init()
+    pygame.display.set_mode(SCREEN_RESOLUTION)
+    yield
+
+
+def test_frames_are_decoded_lazily(setup_pygame):
+    background: Background = Background('bottle', frame_duration=1, prefetch=0)
+    assert len(background.frames) == 0
+
+    first: pygame.Surface = next(background)
+    assert first.get_size() == SCREEN_RESOLUTION
+    assert list(background.frames) == [0]
+    background.close()
+
+
+def test_cache_is_bounded(setup_pygame):
+    background: Background = Background(
+        'bottle', frame_duration=1, cache_size=4, prefetch=2,
+    )
+    for _ in range(12):
+        next(background)
+        assert len(background.frames) <= 4
+    background.close()
+
+    assert background.hits + background.misses == 12
+
+
+def test_prefetch_hits(setup_pygame):
+    background: Background = Background(
+        'bottle', frame_duration=1, cache_size=8, prefetch=4,
+    )
+    next(background)
+    for _ in range(10):
+        # give the worker time to decode the frames ahead
+        time.sleep(0.05)
+        next(background)
+    background.close()
+
+    assert background.misses == 1
+    assert background.hit_rate > 0.9
+
+
+def test_frame_changes_every_duration(setup_pygame):
+    background: Background = Background('bottle', frame_duration=3, prefetch=0)
+    changes = []
+    for _ in range(9):
+        next(background)
+        changes.append(background.frame_changed)
+    background.close()
+
+    assert changes == [False, False, True] * 3
+
+
+def test_frames_from_gif(setup_pygame):
+    from_gif: Background = Background(
+        'background.gif', frame_duration=1, prefetch=0,
+    )
+    from_png: Background = Background('bottle', frame_duration=1, prefetch=0)
+    assert len(from_gif) == len(from_png)
+
+    for _ in range(3):
+        gif_frame: pygame.Surface = next(from_gif)
+        png_frame: pygame.Surface = next(from_png)
+        assert gif_frame.get_size() == SCREEN_RESOLUTION
+        assert (
+            pygame.image.tostring(gif_frame, 'RGB')
+            == pygame.image.tostring(png_frame, 'RGB')
+        )
+    from_gif.close()
+    from_png.close()
@@ -0,0 +1,82 @@
+import numpy as np
+
+from batch_simulator import (
+    BatchSimulator,
+    GAME_OVER_FIELD_FILLED,
+    GAME_OVER_NONE,
+    random_policy,
+)
+from game_core import Action
+
+
+def drop_actions(simulator: BatchSimulator) -> np.ndarray:
+    return np.full(simulator.boards_count, Action.SOFT_DROP.value)
+
+
+def test_spawn():
+    simulator: BatchSimulator = BatchSimulator(100, seed=1)
+    widths: np.ndarray = simulator.shape_widths[simulator.figure_id]
+
+    assert (simulator.pos_y == -1).all()
+    assert (simulator.pos_x >= 0).all()
+    assert (simulator.pos_x + widths <= simulator.x_size).all()
+    assert (simulator.pieces == 1).all()
+
+
+def test_moves_and_borders():
+    simulator: BatchSimulator = BatchSimulator(2, 6, 4, seed=1)
+    simulator.figure_id[:] = 6  # square
+    simulator.pos_x[:] = [0, 2]
+
+    simulator.step(np.array([Action.LEFT.value, Action.RIGHT.value]))
+    assert list(simulator.pos_x) == [0, 2]
+
+    simulator.step(np.array([Action.RIGHT.value, Action.LEFT.value]))
+    assert list(simulator.pos_x) == [1, 1]
+
+
+def test_rotation_blocked_by_border():
+    simulator: BatchSimulator = BatchSimulator(2, 6, 4, seed=1)
+    simulator.figure_id[:] = 11  # horizontal line
+    simulator.pos_x[:] = 0
+    simulator.pos_y[:] = [3, 1]
+
+    simulator.step(np.full(2, Action.ROTATE.value))
+    assert list(simulator.figure_id) == [11, 12]
+
+
+def test_lock_and_clear_rows():
+    simulator: BatchSimulator = BatchSimulator(1, 4, 4, seed=1)
+    simulator.boards[0] = [0, 0, 0b0011, 0b0011]
+    simulator.figure_id[:] = 6
+    simulator.pos_x[:] = 2
+
+    for _ in range(4):
+        locked: np.ndarray = simulator.step(drop_actions(simulator))
+
+    assert list(locked) == [0]
+    assert simulator.points[0] == 2
+    assert list(simulator.boards[0]) == [0, 0, 0, 0]
+    assert simulator.pieces[0] == 2
+    assert simulator.pos_y[0] == -1
+
+
+def test_all_games_finish():
+    simulator: BatchSimulator = BatchSimulator(64, seed=3)
+    results = simulator.run(drop_actions, max_steps=10000)
+
+    assert simulator.game_over.all()
+    assert (results['game_over_reason'] != GAME_OVER_NONE).all()
+    assert (results['game_over_reason'] == GAME_OVER_FIELD_FILLED).any()
+    assert (results['pieces'] > 1).all()
+
+
+def test_random_policy_is_reproducible():
+    first = BatchSimulator(16, seed=5).run(
+        random_policy(np.random.default_rng(1)), max_steps=2000,
+    )
+    second = BatchSimulator(16, seed=5).run(
+        random_policy(np.random.default_rng(1)), max_steps=2000,
+    )
+    for key, values in first.items():
+        assert (values == second[key]).all()
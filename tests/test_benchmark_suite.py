@@ -0,0 +1,34 @@
+from benchmarks.suite import BENCHMARKS, compare, measure
+
+
+def result(seconds_per_operation: float, threshold: float = 0.25):
+    return {
+        'seconds_per_operation': seconds_per_operation,
+        'threshold': threshold,
+    }
+
+
+def test_compare_reports_only_slowdowns_over_the_threshold():
+    baseline = {
+        'fast': result(1.0),
+        'slow': result(1.0),
+        'noisy': result(1.0),
+        'gone': result(1.0),
+    }
+    results = {
+        'fast': result(1.2),
+        'slow': result(1.3),
+        'noisy': result(1.5, threshold=0.5),
+        'new': result(5.0),
+    }
+    assert compare(results, baseline) == ['slow']
+    assert compare(results, baseline, threshold=0.1) == [
+        'fast', 'slow', 'noisy',
+    ]
+
+
+def test_measure():
+    bench = next(b for b in BENCHMARKS if b.name == 'factory.get_figure')
+    measured = measure(bench._replace(repeat=1))
+    assert measured['operations'] == 10000
+    assert measured['seconds_per_operation'] > 0
@@ -0,0 +1,136 @@
+from field import Field
+from figuresfactory import FiguresFactory
+
+
+def drop_figure(field: Field, figure) -> int:
+    stop_moving: bool = False
+    points: int = 0
+    while not stop_moving:
+        is_bottom_intersection, redraw_rotation = field.try_to_move_vertically(
+            figure, 1, False,
+        )
+        stop_moving, points = field.overlay(
+            figure, is_bottom_intersection, redraw_rotation,
+        )
+    return points
+
+
+def test_empty_frame():
+    field: Field = Field(4, 3)
+    assert list(field.current_frame) == [[0, 0, 0]] * 4
+    assert len(field.current_frame) == 4
+
+
+def test_drop_to_bottom():
+    field: Field = Field(4, 4)
+    figure = FiguresFactory(4).get_specific_figure(6)  # square
+    figure.current_pos[0] = 1
+
+    assert drop_figure(field, figure) == 0
+    assert list(field.current_frame) == [
+        [0, 0, 0, 0],
+        [0, 0, 0, 0],
+        [0, 1, 1, 0],
+        [0, 1, 1, 0],
+    ]
+
+
+def test_move_horizontally_borders():
+    field: Field = Field(4, 4)
+    figure = FiguresFactory(4).get_specific_figure(6)
+    figure.current_pos[0] = 0
+
+    field.try_to_move_horizontally(figure, -1)
+    assert figure.current_pos[0] == 0
+
+    field.try_to_move_horizontally(figure, 1)
+    field.try_to_move_horizontally(figure, 1)
+    field.try_to_move_horizontally(figure, 1)
+    assert figure.current_pos[0] == 2
+
+
+def test_move_horizontally_blocked_by_figures():
+    field: Field = Field(4, 4)
+    factory: FiguresFactory = FiguresFactory(4)
+    vertical_line = factory.get_specific_figure(12)
+    vertical_line.current_pos[0] = 2
+    drop_figure(field, vertical_line)
+
+    square = factory.get_specific_figure(6)
+    square.current_pos = [0, 1]
+    field.try_to_move_horizontally(square, 1)
+    assert square.current_pos[0] == 0
+
+
+def test_rotation_blocked_by_border():
+    field: Field = Field(6, 4)
+    horizontal_line = FiguresFactory(4).get_specific_figure(11)
+    horizontal_line.current_pos = [0, 3]
+
+    assert not field.try_to_rotate_figure(horizontal_line)
+    assert horizontal_line.id == 11
+
+    horizontal_line.current_pos = [0, 1]
+    assert field.try_to_rotate_figure(horizontal_line)
+    assert horizontal_line.id == 12
+
+
+def test_delete_full_rows():
+    field: Field = Field(4, 4)
+    factory: FiguresFactory = FiguresFactory(4)
+    for pos_x in (0, 2):
+        square = factory.get_specific_figure(6)
+        square.current_pos[0] = pos_x
+        points: int = drop_figure(field, square)
+
+    assert points == 2
+    assert list(field.current_frame) == [[0, 0, 0, 0]] * 4
+
+
+def test_is_almost_filled():
+    field: Field = Field(4, 4)
+    assert not field.is_almost_filled()
+
+    vertical_line = FiguresFactory(4).get_specific_figure(12)
+    vertical_line.current_pos[0] = 0
+    drop_figure(field, vertical_line)
+    assert not field.is_almost_filled()
+
+    for pos_x in (1, 2):
+        vertical_line = FiguresFactory(4).get_specific_figure(12)
+        vertical_line.current_pos[0] = pos_x
+        drop_figure(field, vertical_line)
+    assert field.is_almost_filled()
+
+
+def test_dirty_cells():
+    field: Field = Field(4, 4)
+    square = FiguresFactory(4).get_specific_figure(6)
+    square.current_pos = [0, -1]
+
+    field.overlay(square, *field.try_to_move_vertically(square, 1, False))
+    assert field.pop_dirty_cells() == {(0, 0), (1, 0), (0, 1), (1, 1)}
+    assert field.pop_dirty_cells() == set()
+
+    field.overlay(square, *field.try_to_move_vertically(square, 1, False))
+    assert field.pop_dirty_cells() == {(0, 0), (1, 0), (0, 2), (1, 2)}
+
+
+def test_cleared_rows_are_reported_as_shifted_range():
+    field: Field = Field(6, 2)
+    square = FiguresFactory(2).get_specific_figure(6)
+    square.current_pos = [0, -1]
+
+    assert drop_figure(field, square) == 2
+    assert field.pop_shifted_rows() == 6
+    assert field.pop_shifted_rows() == 0
+    assert field.current_rows == [0] * 6
+
+
+def test_huge_field():
+    field: Field = Field(2000, 1000)
+    figure = FiguresFactory(1000).get_specific_figure(12)
+    figure.current_pos[0] = 999
+
+    assert drop_figure(field, figure) == 0
+    assert field.current_rows[-1] == 1 << 999
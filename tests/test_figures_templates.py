@@ -0,0 +1,38 @@
+from figures_templates import (
+    figures_sequences,
+    get_id_next_figure,
+    possible_figures_templates,
+    shapes,
+)
+
+
+def test_rotation_cycles():
+    assert get_id_next_figure(0) == 1
+    assert get_id_next_figure(1) == 0
+    assert get_id_next_figure(5) == 2
+    assert get_id_next_figure(6) == 6
+    assert get_id_next_figure(100) == -1
+    assert figures_sequences[1].next_elem(3) == 4
+    assert figures_sequences[1].next_elem(7) is None
+
+
+def test_shapes_match_templates():
+    assert len(shapes) == len(possible_figures_templates)
+    for figure_id, template in enumerate(possible_figures_templates):
+        shape = shapes[figure_id]
+        assert shape.id == figure_id
+        assert shape.next_id == get_id_next_figure(figure_id)
+        assert shape.y_size == len(template)
+        assert shape.x_size == len(template[0])
+        for x, y in shape.cells:
+            assert template[y][x] == 1
+            assert shape.row_masks[y] & (1 << x)
+        assert len(shape.cells) == sum(map(sum, template))
+
+
+def test_shape_bounding_data():
+    # [[0, 1, 0], [1, 1, 1]]
+    assert shapes[7].row_masks == (0b010, 0b111)
+    assert shapes[7].bottom_profile == (1, 1, 1)
+    # [[1, 1, 1], [0, 1, 0]]
+    assert shapes[9].bottom_profile == (0, 1, 0)
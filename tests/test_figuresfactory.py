@@ -0,0 +1,127 @@
+import random
+
+import pytest
+
+from figures_templates import figures_sequences, shapes
+from figuresfactory import (
+    FIGURES_POOL_SIZE,
+    BagGenerator,
+    FiguresFactory,
+    WeightedGenerator,
+)
+from game_core import Action, GameCore, GameState
+
+
+def test_figure_has_no_instance_dict():
+    figure = FiguresFactory(10).get_figure()
+    with pytest.raises(AttributeError):
+        figure.color = 'red'
+
+
+def test_released_figures_are_reused_with_the_same_sequence():
+    fresh: FiguresFactory = FiguresFactory(10, random.Random(5))
+    pooled: FiguresFactory = FiguresFactory(10, random.Random(5))
+    fresh.get_figure()
+    figure = pooled.get_figure()
+    for _ in range(100):
+        expected = fresh.get_figure()
+        pooled.release(figure)
+        assert pooled.get_figure() is figure
+        assert (figure.id, figure.current_pos) == (
+            expected.id, expected.current_pos,
+        )
+
+
+def test_pool_is_bounded():
+    figures_factory: FiguresFactory = FiguresFactory(10)
+    for _ in range(FIGURES_POOL_SIZE * 2):
+        figures_factory.release(figures_factory.get_figure())
+        figures_factory.release(FiguresFactory(10).get_figure())
+    assert len(figures_factory.pool) == FIGURES_POOL_SIZE
+
+
+def test_core_recycles_locked_figures():
+    core: GameCore = GameCore(seed=2)
+    figure = core.current_figure
+    state: GameState = core.last_state
+    while not state.figure_locked:
+        core.step(Action.SOFT_DROP)
+        state = core.step(Action.TICK)
+    assert core.current_figure is figure
+    assert core.current_figure.current_pos[1] == -1
+
+
+def test_uniform_sequence_is_drawn_from_the_factory_rng():
+    rng: random.Random = random.Random(9)
+    expected = []
+    for _ in range(20):
+        figure_id: int = rng.randint(0, len(shapes) - 1)
+        expected.append(
+            (figure_id, rng.randint(0, 10 - shapes[figure_id].x_size)),
+        )
+
+    figures_factory: FiguresFactory = FiguresFactory(10, random.Random(9))
+    spawned = []
+    for _ in range(20):
+        figure = figures_factory.get_figure()
+        spawned.append((figure.id, figure.current_pos[0]))
+    assert spawned == expected
+
+
+def test_preview_shows_the_next_figures():
+    figures_factory: FiguresFactory = FiguresFactory(
+        10, random.Random(1), preview_size=3,
+    )
+    upcoming = figures_factory.preview()
+    assert len(upcoming) == 3
+    assert figures_factory.preview(5)[:3] == upcoming
+    assert [figures_factory.get_figure().id for _ in range(3)] == upcoming
+
+
+def test_pregenerated_figures_do_not_use_the_rng():
+    rng: random.Random = random.Random(1)
+    figures_factory: FiguresFactory = FiguresFactory(10, rng)
+    figures_factory.pregenerate(100)
+    state = rng.getstate()
+    for _ in range(100):
+        figures_factory.release(figures_factory.get_figure())
+    assert rng.getstate() == state
+
+    ids, columns = figures_factory.take(50)
+    assert len(ids) == len(columns) == 50
+    assert all(
+        0 <= pos_x <= 10 - shapes[figure_id].x_size
+        for figure_id, pos_x in zip(ids, columns)
+    )
+
+
+def test_bag_deals_every_family_once_per_bag():
+    figures_factory: FiguresFactory = FiguresFactory(
+        10, random.Random(3), generator=BagGenerator(),
+    )
+    ids, _ = figures_factory.take(len(figures_sequences) * 20)
+    family_of = {
+        figure_id: number
+        for number, sequence in enumerate(figures_sequences)
+        for figure_id in sequence.values
+    }
+    for start in range(0, len(ids), len(figures_sequences)):
+        bag = ids[start:start + len(figures_sequences)]
+        assert sorted(family_of[figure_id] for figure_id in bag) == list(
+            range(len(figures_sequences)),
+        )
+
+
+def test_weighted_generator():
+    weights = [0.0] * len(shapes)
+    weights[6] = 1.0
+    weights[11] = 3.0
+    figures_factory: FiguresFactory = FiguresFactory(
+        10, random.Random(4), generator=WeightedGenerator(weights),
+    )
+    ids, _ = figures_factory.take(400)
+    assert set(ids) == {6, 11}
+    assert ids.count(11) > ids.count(6)
+
+    with pytest.raises(ValueError):
+        WeightedGenerator([1.0])
@@ -0,0 +1,68 @@
+from game_core import (
+    Action,
+    GameCore,
+    GameState,
+    GAME_OVER_FIELD_FILLED,
+    GAME_OVER_SPEED_CAP,
+)
+from settings import SPEED_LEVELS
+
+
+def test_gravity_works_every_speed_level_ticks():
+    core: GameCore = GameCore()
+    start_y: int = core.current_figure.current_pos[1]
+
+    for _ in range(SPEED_LEVELS[0]):
+        core.step(Action.TICK)
+    assert core.current_figure.current_pos[1] == start_y
+
+    core.step(Action.TICK)
+    assert core.current_figure.current_pos[1] == start_y + 1
+
+
+def test_soft_drop():
+    core: GameCore = GameCore()
+    start_y: int = core.current_figure.current_pos[1]
+
+    core.step(Action.SOFT_DROP)
+    state: GameState = core.step(Action.TICK)
+    assert core.current_figure.current_pos[1] == start_y + 1
+    assert state.ticks == 1
+
+
+def test_horizontal_moves():
+    core: GameCore = GameCore()
+    core.current_figure.current_pos[0] = 1
+
+    core.step(Action.LEFT)
+    assert core.current_figure.current_pos[0] == 0
+    core.step(Action.LEFT)
+    assert core.current_figure.current_pos[0] == 0
+    core.step(Action.RIGHT)
+    assert core.current_figure.current_pos[0] == 1
+
+
+def test_game_ends_when_field_is_filled():
+    core: GameCore = GameCore(seed=0)
+    state: GameState = core.step()
+    for _ in range(10000):
+        if state.game_over:
+            break
+        core.step(Action.SOFT_DROP)
+        state = core.step(Action.TICK)
+
+    assert state.game_over_reason == GAME_OVER_FIELD_FILLED
+    assert state.pieces > 1
+    assert core.step(Action.TICK) is state
+    assert core.step(Action.LEFT) is state
+
+
+def test_game_ends_on_speed_cap():
+    core: GameCore = GameCore()
+    core.points = (len(SPEED_LEVELS) - 1) * 10 - 1
+    core.speed_level = len(SPEED_LEVELS) - 1
+    core.step(Action.SOFT_DROP)
+    state: GameState = core.step(Action.TICK)
+
+    assert state.game_over
+    assert state.game_over_reason == GAME_OVER_SPEED_CAP
@@ -0,0 +1,68 @@
+import os
+
+from PIL import Image
+
+from utils.gifextract import iter_frames, process_image
+
+
+def make_gif(path: str):
+    first = Image.new('RGB', (4, 4), (255, 0, 0))
+    second = first.copy()
+    second.putpixel((0, 0), (0, 0, 255))
+    third = second.copy()
+    third.putpixel((3, 3), (0, 255, 0))
+    first.save(path, save_all=True, append_images=[second, third])
+
+
+def make_transparent_gif(path: str):
+    # full-size frames, each cleared to transparency before the next one
+    frames: list = []
+    for position, color in (((0, 0), 1), ((3, 3), 2)):
+        frame = Image.new('P', (4, 4), 0)
+        frame.putpalette([0, 0, 0, 255, 0, 0, 0, 255, 0] + [0] * 253 * 3)
+        frame.putpixel(position, color)
+        frames.append(frame)
+    frames[0].save(
+        path,
+        save_all=True,
+        append_images=frames[1:],
+        disposal=2,
+        transparency=0,
+    )
+
+
+def test_frames_are_complete(tmp_path):
+    path: str = str(tmp_path / 'animation.gif')
+    make_gif(path)
+    frames = [frame.convert('RGB') for frame in iter_frames(path)]
+
+    assert len(frames) == 3
+    assert frames[2].getpixel((0, 0)) == (0, 0, 255)
+    assert frames[2].getpixel((3, 3)) == (0, 255, 0)
+    assert frames[2].getpixel((1, 1)) == (255, 0, 0)
+
+
+def test_disposed_frames_do_not_show_through(tmp_path):
+    path: str = str(tmp_path / 'transparent.gif')
+    make_transparent_gif(path)
+    frames = list(iter_frames(path))
+
+    assert len(frames) == 2
+    assert frames[0].getpixel((0, 0)) == (255, 0, 0, 255)
+    assert frames[1].getpixel((0, 0))[3] == 0
+    assert frames[1].getpixel((3, 3)) == (0, 255, 0, 255)
+
+
+def test_scaled_parallel_extraction(tmp_path):
+    path: str = str(tmp_path / 'animation.gif')
+    make_gif(path)
+    dest_folder = tmp_path / 'frames'
+    dest_folder.mkdir()
+
+    assert process_image(path, str(dest_folder), size=(8, 8), workers=2) == 3
+    assert sorted(os.listdir(dest_folder)) == [
+        'animation-0.png', 'animation-1.png', 'animation-2.png',
+    ]
+    last_frame = Image.open(dest_folder / 'animation-2.png').convert('RGB')
+    assert last_frame.size == (8, 8)
+    assert last_frame.getpixel((7, 7)) == (0, 255, 0)
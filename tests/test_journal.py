@@ -0,0 +1,102 @@
+import csv
+import os
+
+from scores.journal import INDEX_FILE, JOURNAL_FILE, JournalReader
+from scores.scores import Scores
+
+
+def play(root_dir: str, games, compact_threshold: int = 1000) -> Scores:
+    reader: JournalReader = JournalReader(
+        root_dir, compact_threshold=compact_threshold, top_size=3,
+    )
+    scores: Scores = Scores(reader)
+    for points, username in games:
+        scores.update(
+            score=points, username=username, timestamp='2020-01-07T00:00:00',
+        )
+    scores.rewrite()
+    reader.wait_for_compaction()
+    return scores
+
+
+def test_records_are_appended(tmp_path):
+    play(str(tmp_path), [(1, 'a'), (5, 'b')])
+    scores: Scores = play(str(tmp_path), [(3, 'c')])
+
+    with open(tmp_path / JOURNAL_FILE) as journal:
+        assert [row[:2] for row in csv.reader(journal)] == [
+            ['1', 'a'], ['5', 'b'], ['3', 'c'],
+        ]
+    # only the records of this session are appended
+    scores.rewrite()
+    assert len(scores.reader.read()) == 3
+
+
+def test_compaction_keeps_top(tmp_path):
+    for game in range(10):
+        play(str(tmp_path), [(game, f'user{game % 4}')], compact_threshold=3)
+
+    reader: JournalReader = JournalReader(str(tmp_path), top_size=3)
+    scores: Scores = Scores(reader)
+    assert [points for points, _, _ in scores.scores_table.get_top(3)] == [
+        9, 8, 7,
+    ]
+    # startup reads the index and the short journal tail only
+    assert len(scores.scores_table) < 10
+    assert reader.index.records == 9
+    assert reader.get_user_best('user1') == (5, 'user1', '2020-01-07T00:00:00')
+    assert os.path.exists(tmp_path / INDEX_FILE)
+
+
+def test_legacy_scores_are_imported(tmp_path):
+    with open(tmp_path / 'scores.dat', 'w') as legacy:
+        legacy.write('4,old,2020-01-01T00:00:00\n7,older,2020-01-01T00:00:00\n')
+
+    scores: Scores = play(str(tmp_path), [(5, 'new')])
+    assert [username for _, username, _ in scores.scores_table.get_top(3)] == [
+        'older', 'new', 'old',
+    ]
+    reloaded: Scores = Scores(JournalReader(str(tmp_path), top_size=3))
+    assert reloaded.scores_table.get_top(3) == scores.scores_table.get_top(3)
+
+
+def test_torn_journal_line_is_skipped(tmp_path):
+    play(str(tmp_path), [(2, 'a')])
+    with open(tmp_path / JOURNAL_FILE, 'a') as journal:
+        journal.write('1')
+
+    scores: Scores = Scores(JournalReader(str(tmp_path)))
+    assert scores.scores_table.get_scores() == [
+        (2, 'a', '2020-01-07T00:00:00'),
+    ]
+
+    play(str(tmp_path), [(3, 'b')])
+    scores = Scores(JournalReader(str(tmp_path)))
+    assert scores.scores_table.get_scores() == [
+        (2, 'a', '2020-01-07T00:00:00'),
+        (3, 'b', '2020-01-07T00:00:00'),
+    ]
+
+
+def test_repeated_legacy_records_are_collapsed(tmp_path):
+    with open(tmp_path / 'scores.dat', 'w') as legacy:
+        legacy.write(
+            '4,old,2020-01-01T00:00:00\n'
+            '4,old,2020-01-01T00:00:01\n'
+            '4,old,2020-01-01T00:00:02\n'
+            '4,old,2020-01-01T00:05:00\n'
+            '1,other,2020-01-02T00:00:00\n'
+            '4,old,2020-01-03T00:00:00\n',
+        )
+
+    reader: JournalReader = JournalReader(str(tmp_path), top_size=4)
+    scores: Scores = Scores(reader)
+    assert reader.index.records == 4
+    # equal results of different games stay apart in the loaded top, also
+    # when they are minutes apart only
+    assert scores.scores_table.get_top(4) == [
+        (4, 'old', '2020-01-01T00:00:00'),
+        (4, 'old', '2020-01-01T00:05:00'),
+        (4, 'old', '2020-01-03T00:00:00'),
+        (1, 'other', '2020-01-02T00:00:00'),
+    ]
@@ -0,0 +1,70 @@
+import random
+from collections import deque
+
+from field import Field
+from figures_templates import shapes
+from placements import enumerate_placements
+
+
+def naive_placements(field: Field, figure_id: int, start_x: int) -> set:
+    start = (figure_id, start_x, -1)
+    visited = {start}
+    queue = deque([start])
+    resting = set()
+    while queue:
+        shape_id, pos_x, pos_y = queue.popleft()
+        if not field.fits(shapes[shape_id], pos_x, pos_y + 1):
+            resting.add((shape_id, pos_x, pos_y))
+        for state in (
+                (shape_id, pos_x, pos_y + 1),
+                (shape_id, pos_x - 1, pos_y),
+                (shape_id, pos_x + 1, pos_y),
+                (shapes[shape_id].next_id, pos_x, pos_y),
+        ):
+            if state not in visited and field.fits(
+                    shapes[state[0]], state[1], state[2],
+            ):
+                visited.add(state)
+                queue.append(state)
+    return resting
+
+
+def random_field(rng: random.Random, filled_rows: int) -> Field:
+    field: Field = Field(20, 10)
+    for y in range(20 - filled_rows, 20):
+        field.stable_rows[y] = rng.getrandbits(10) & ~(1 << rng.randint(0, 9))
+    return field
+
+
+def test_empty_field():
+    placements = enumerate_placements(Field(20, 10), 6)
+    assert sorted(p.x for p in placements) == list(range(9))
+    assert all(p.y == 18 and p.lines_cleared == 0 for p in placements)
+
+
+def test_matches_naive_search():
+    rng: random.Random = random.Random(1)
+    for _ in range(30):
+        field: Field = random_field(rng, rng.randint(0, 12))
+        for figure_id in range(len(shapes)):
+            placements = enumerate_placements(field, figure_id, start_x=0)
+            found = {(p.figure_id, p.x, p.y) for p in placements}
+            assert len(found) == len(placements)
+            assert found == naive_placements(field, figure_id, 0)
+
+
+def test_resulting_board_and_cleared_lines():
+    field: Field = Field(6, 4)
+    field.stable_rows[:] = [0, 0, 0, 0, 0b0111, 0b0111]
+    placements = enumerate_placements(field, 12)  # vertical line
+
+    clearing = [p for p in placements if p.x == 3]
+    assert len(clearing) == 1
+    assert clearing[0].lines_cleared == 2
+    assert clearing[0].rows == (0, 0, 0, 0, 0b1000, 0b1000)
+
+
+def test_blocked_start():
+    field: Field = Field(4, 4)
+    field.stable_rows[:] = [0b1111, 0b1111, 0b1111, 0b1111]
+    assert enumerate_placements(field, 6) == []
@@ -0,0 +1,41 @@
+import json
+import time
+
+from profiler import FrameProfiler
+
+
+def test_disabled_profiler_records_nothing():
+    profiler: FrameProfiler = FrameProfiler(enabled=False)
+    with profiler.phase('draw'):
+        pass
+    assert profiler.summary() == []
+    assert len(profiler.events) == 0
+
+
+def test_percentiles_of_rolling_window():
+    profiler: FrameProfiler = FrameProfiler(window=100, enabled=True)
+    for duration in range(200):
+        profiler.record('draw', 0.0, duration / 1000)
+
+    # only the last 100 durations, 0.100 to 0.199, are kept
+    assert profiler.percentiles('draw') == (0.15, 0.195, 0.199)
+    assert profiler.percentiles('unknown') == (0.0, 0.0, 0.0)
+
+
+def test_chrome_trace_export(tmp_path):
+    profiler: FrameProfiler = FrameProfiler(trace_size=2, enabled=True)
+    for _ in range(3):
+        with profiler.phase('frame'):
+            with profiler.phase('draw'):
+                time.sleep(0.001)
+
+    filename: str = str(tmp_path / 'frames.json')
+    profiler.export_chrome_trace(filename)
+    with open(filename) as trace_file:
+        events = json.load(trace_file)['traceEvents']
+    # inner phases end first, the last frame keeps both of its phases
+    assert [event['name'] for event in events] == ['draw', 'frame']
+    draw, frame = events
+    assert frame['ts'] <= draw['ts']
+    assert draw['ts'] + draw['dur'] <= frame['ts'] + frame['dur']
+    assert draw['dur'] >= 1000
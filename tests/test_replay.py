@@ -0,0 +1,69 @@
+import random
+from typing import Tuple
+
+import pytest
+
+from game_core import Action, GameCore, GameState
+from replay import (
+    REPLAY_HEADER,
+    Replay,
+    ReplayPlayer,
+    read_varint,
+    write_varint,
+)
+from tournament import BOT_ACTIONS, new_bot_rng
+
+
+def record_bot_game(
+        seed: int, max_ticks: int = 20000,
+) -> Tuple[Replay, GameCore]:
+    replay: Replay = Replay(seed)
+    core: GameCore = replay.new_core()
+    bot_rng: random.Random = new_bot_rng(seed)
+    state: GameState = core.last_state
+    while not state.game_over and state.ticks < max_ticks:
+        action: Action = bot_rng.choice(BOT_ACTIONS)
+        if action != Action.TICK:
+            replay.record(core.ticks, action)
+            core.step(action)
+        state = core.step(Action.TICK)
+    replay.finish(core.ticks)
+    return replay, core
+
+
+@pytest.mark.parametrize('value', [0, 1, 127, 128, 300, 2 ** 40])
+def test_varint_round_trip(value):
+    data: bytearray = bytearray()
+    write_varint(data, value)
+    assert read_varint(bytes(data), 0) == (value, len(data))
+
+
+def test_replay_reproduces_the_game():
+    recorded, core = record_bot_game(seed=3)
+    replay: Replay = Replay.from_bytes(recorded.to_bytes())
+    assert replay.events == recorded.events
+    assert replay.end_tick == recorded.end_tick
+
+    player: ReplayPlayer = ReplayPlayer(replay)
+    state: GameState = player.run()
+    assert state == core.last_state
+    assert player.core.field.current_rows == core.field.current_rows
+
+
+def test_unfinished_game_stops_at_the_last_tick(tmp_path):
+    recorded, _ = record_bot_game(seed=4, max_ticks=300)
+    recorded.save(str(tmp_path / 'game.replay'))
+
+    state: GameState = ReplayPlayer(
+        Replay.load(str(tmp_path / 'game.replay')),
+    ).run()
+    assert state.ticks == 300
+    assert not state.game_over
+
+
+def test_replay_is_compact():
+    replay, _ = record_bot_game(seed=9)
+    # two bytes per input while inputs are less than 128 ticks apart
+    assert len(replay.to_bytes()) == REPLAY_HEADER.size + 2 * (
+        len(replay.events) + 1
+    )
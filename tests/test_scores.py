@@ -1,6 +1,9 @@
 import os
+import random
+import threading
+import time
 import pytest
-from scores.scores import CSVReader, Scores
+from scores.scores import CSVReader, Scores, ScoresTable
 
 
 def test_init():
@@ -71,3 +74,120 @@ def test_add_points_multi_reload(drop_scores_file):
         (1, 'test1', '2020-01-07T00:00:00'),
         (2, 'test2', '2020-01-07T00:00:00'),
     ]
+
+
+def test_points_are_parsed_once():
+    scores: Scores = Scores(CSVReader('.'))
+
+    scores.update(score='12', username='test', timestamp='2020-01-07T00:00:00')
+    assert scores.scores_table.get_scores() == [
+        (12, 'test', '2020-01-07T00:00:00'),
+    ]
+
+
+def test_top_scores():
+    scores_table: ScoresTable = ScoresTable(leaderboard_size=3)
+    for points, username in [
+            (5, 'a'), ('7', 'b'), (1, 'c'), (7, 'd'), (6, 'e'), (0, 'f'),
+    ]:
+        scores_table.add_record(points, username, '2020-01-07T00:00:00')
+
+    assert [
+        (points, username) for points, username, _ in scores_table.get_top(5)
+    ] == [(7, 'b'), (7, 'd'), (6, 'e')]
+    assert len(scores_table.get_top(1)) == 1
+    assert len(scores_table) == 6
+
+
+def test_top_matches_full_sort():
+    rng: random.Random = random.Random(0)
+    scores_table: ScoresTable = ScoresTable(leaderboard_size=10)
+    for i in range(1000):
+        scores_table.add_record(rng.randint(0, 100), f'user{i}', '')
+
+    expected = sorted(
+        scores_table.get_scores(), key=lambda x: x[0], reverse=True,
+    )[:10]
+    assert scores_table.get_top(10) == expected
+
+
+def test_session_is_submitted_once(drop_scores_file):
+    scores: Scores = Scores(CSVReader('.'))
+
+    assert scores.submit('s1', 3, 'test', '2020-01-07T00:00:00')
+    assert not scores.submit('s1', 3, 'test', '2020-01-07T00:00:01')
+    assert scores.submit('s2', 3, 'test', '2020-01-07T00:00:02')
+    scores.rewrite()
+
+    scores = Scores(CSVReader('.'))
+    assert not scores.submit('s1', 3, 'test', '2020-01-07T00:00:03')
+    assert scores.scores_table.get_scores() == [
+        (3, 'test', '2020-01-07T00:00:00'),
+        (3, 'test', '2020-01-07T00:00:02'),
+    ]
+
+
+def test_repeated_legacy_records_are_collapsed(drop_scores_file):
+    with open('./scores.dat', 'w') as scores_file:
+        scores_file.write(
+            '3,test,2020-01-07T00:00:00\n'
+            '3,test,2020-01-07T00:00:01\n'
+            '3,test,2020-01-07T00:00:02\n'
+            '5,other,2020-01-08T00:00:00\n'
+            '3,test,2020-01-09T00:00:00\n',
+        )
+
+    scores: Scores = Scores(CSVReader('.'))
+    assert scores.scores_table.get_scores() == [
+        (3, 'test', '2020-01-07T00:00:00'),
+        (5, 'other', '2020-01-08T00:00:00'),
+        (3, 'test', '2020-01-09T00:00:00'),
+    ]
+
+
+def test_equal_legacy_results_of_separate_games_are_kept(drop_scores_file):
+    with open('./scores.dat', 'w') as scores_file:
+        scores_file.write(
+            '0,test,2020-01-07T00:00:00\n'
+            '0,test,2020-01-07T00:00:01\n'
+            '0,test,2020-01-07T00:03:00\n'
+            '0,test,2020-01-07T00:03:01\n',
+        )
+
+    scores: Scores = Scores(CSVReader('.'))
+    assert scores.scores_table.get_scores() == [
+        (0, 'test', '2020-01-07T00:00:00'),
+        (0, 'test', '2020-01-07T00:03:00'),
+    ]
+    scores.reader.rewrite(scores.scores_table)
+    with open('./scores.dat') as scores_file:
+        assert scores_file.read().splitlines() == [
+            '0,test,2020-01-07T00:00:00',
+            '0,test,2020-01-07T00:03:00',
+        ]
+
+
+def test_record_added_during_replace_synced_is_kept():
+    scores_table: ScoresTable = ScoresTable()
+    scores_table.add_record(1, 'a', 't', 's1')
+    scores_table.mark_synced()
+    adding: threading.Thread = threading.Thread(
+        target=scores_table.add_record, args=(2, 'b', 't', 's2'),
+    )
+
+    def fresh_rows():
+        # the game thread adds a record while the fresh table is built
+        adding.start()
+        time.sleep(0.05)
+        yield 1, 'a', 't', 's1'
+        yield 3, 'c', 't', 's3'
+
+    with scores_table.lock:
+        scores_table.replace_synced(fresh_rows())
+    adding.join()
+
+    assert scores_table.get_scores() == [
+        (1, 'a', 't'), (3, 'c', 't'), (2, 'b', 't'),
+    ]
+    assert scores_table.get_unsynced() == [(2, 'b', 't', 's2')]
+    assert scores_table.get_top(1) == [(3, 'c', 't')]
@@ -0,0 +1,240 @@
+import json
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List
+from urllib.parse import unquote, urlparse
+
+import httplib2
+import pytest
+from googleapiclient.discovery import build_from_document
+
+from scores.scores import GoogleSheetsReader, Scores
+
+
+class SheetsStandIn(ThreadingHTTPServer):
+    # local HTTP stand-in for the values endpoints of the Sheets API
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), SheetsHandler)
+        self.rows: List[List[str]] = []
+        self.failures: int = 0
+        self.write_failures: int = 0
+        self.requests: List[str] = []
+        self.gate: threading.Event = threading.Event()
+        self.gate.set()
+
+    @property
+    def url(self) -> str:
+        return f'http://127.0.0.1:{self.server_address[1]}/'
+
+
+class SheetsHandler(BaseHTTPRequestHandler):
+    server: SheetsStandIn
+
+    def do_GET(self):
+        path: str = unquote(urlparse(self.path).path)
+        match = re.search(r'/values/\w+!A(\d+):D(\d+)$', path)
+        if not self.__accept('get', path) or match is None:
+            return
+        first_row, last_row = int(match.group(1)), int(match.group(2))
+        rows: List[List[str]] = self.server.rows[first_row - 1:last_row]
+        self.__respond(200, {'values': rows} if rows else {})
+
+    def do_POST(self):
+        path: str = unquote(urlparse(self.path).path)
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        if not self.__accept('append', path):
+            return
+        if not path.endswith(':append'):
+            self.__respond(404, {})
+            return
+        if self.server.write_failures:
+            self.server.write_failures -= 1
+            self.__respond(503, {'error': {'code': 503}})
+            return
+        self.server.rows.extend(
+            [str(value) for value in row] for row in body['values']
+        )
+        self.__respond(200, {'updates': {'updatedRows': len(body['values'])}})
+
+    def log_message(self, *args):
+        pass
+
+    def __accept(self, method: str, path: str) -> bool:
+        self.server.gate.wait()
+        self.server.requests.append(method)
+        if self.server.failures:
+            self.server.failures -= 1
+            self.__respond(503, {'error': {'code': 503}})
+            return False
+        return True
+
+    def __respond(self, status: int, body):
+        payload: bytes = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+@pytest.fixture(scope='function')
+def sheets():
+    server: SheetsStandIn = SheetsStandIn()
+    thread = threading.Thread(
+        target=server.serve_forever,
+        kwargs={'poll_interval': 0.01},
+        daemon=True,
+    )
+    thread.start()
+    yield server
+    server.gate.set()
+    server.shutdown()
+    server.server_close()
+
+
+def discovery_document(root_url: str) -> dict:
+    # the values endpoints of the Sheets API discovery document; a local
+    # copy works with every google-api-python-client version and offline
+    path_parameter: dict = {
+        'type': 'string', 'required': True, 'location': 'path',
+    }
+    query_parameter: dict = {'type': 'string', 'location': 'query'}
+    return {
+        'kind': 'discovery#restDescription',
+        'discoveryVersion': 'v1',
+        'id': 'sheets:v4',
+        'name': 'sheets',
+        'version': 'v4',
+        'protocol': 'rest',
+        'rootUrl': root_url,
+        'servicePath': '',
+        'baseUrl': root_url,
+        'batchPath': 'batch',
+        'parameters': {},
+        'schemas': {
+            'ValueRange': {'id': 'ValueRange', 'type': 'object'},
+        },
+        'resources': {
+            'spreadsheets': {
+                'resources': {
+                    'values': {
+                        'methods': {
+                            'get': {
+                                'id': 'sheets.spreadsheets.values.get',
+                                'path': 'v4/spreadsheets/{spreadsheetId}'
+                                        '/values/{range}',
+                                'httpMethod': 'GET',
+                                'parameters': {
+                                    'spreadsheetId': path_parameter,
+                                    'range': path_parameter,
+                                },
+                                'parameterOrder': ['spreadsheetId', 'range'],
+                                'response': {'$ref': 'ValueRange'},
+                            },
+                            'append': {
+                                'id': 'sheets.spreadsheets.values.append',
+                                'path': 'v4/spreadsheets/{spreadsheetId}'
+                                        '/values/{range}:append',
+                                'httpMethod': 'POST',
+                                'parameters': {
+                                    'spreadsheetId': path_parameter,
+                                    'range': path_parameter,
+                                    'valueInputOption': query_parameter,
+                                    'insertDataOption': query_parameter,
+                                },
+                                'parameterOrder': ['spreadsheetId', 'range'],
+                                'request': {'$ref': 'ValueRange'},
+                                'response': {'$ref': 'ValueRange'},
+                            },
+                        },
+                    },
+                },
+            },
+        },
+    }
+
+
+def make_reader(
+        tmp_path, sheets: SheetsStandIn, **kwargs,
+) -> GoogleSheetsReader:
+    service = build_from_document(
+        discovery_document(sheets.url), http=httplib2.Http(),
+    )
+    return GoogleSheetsReader(
+        service_factory=lambda: service,
+        cache_dir=str(tmp_path),
+        retry_delays=(0.01, 0.01),
+        **kwargs,
+    )
+
+
+def test_read_does_not_wait_for_service(tmp_path, sheets):
+    sheets.rows = [['3', 'a', 't']]
+    sheets.gate.clear()
+    reader: GoogleSheetsReader = make_reader(tmp_path, sheets)
+    scores: Scores = Scores(reader)
+    assert scores.scores_table.get_scores() == []
+
+    sheets.gate.set()
+    reader.close()
+    assert scores.scores_table.get_scores() == [(3, 'a', 't')]
+
+    # the next start shows the snapshot before the service answers
+    sheets.gate.clear()
+    reader = make_reader(tmp_path, sheets)
+    assert Scores(reader).scores_table.get_scores() == [(3, 'a', 't')]
+    sheets.gate.set()
+    reader.close()
+
+
+def test_sheet_is_read_in_chunks(tmp_path, sheets):
+    sheets.rows = [[str(i), f'user{i}', 't'] for i in range(25)]
+    reader: GoogleSheetsReader = make_reader(
+        tmp_path, sheets, read_chunk_size=10,
+    )
+    scores: Scores = Scores(reader)
+    reader.close()
+
+    assert len(scores.scores_table) == 25
+    assert sheets.requests == ['get', 'get', 'get']
+
+
+def test_only_new_records_are_appended(tmp_path, sheets):
+    sheets.rows = [['3', 'a', 't']]
+    reader: GoogleSheetsReader = make_reader(tmp_path, sheets)
+    scores: Scores = Scores(reader)
+    reader.close()
+
+    reader = make_reader(tmp_path, sheets)
+    scores = Scores(reader)
+    sheets.write_failures = 2
+    scores.update(score=5, username='b', timestamp='t')
+    scores.rewrite()
+    scores.rewrite()  # nothing new, nothing is sent
+    reader.close()
+
+    assert sheets.rows == [['3', 'a', 't'], ['5', 'b', 't']]
+    assert sheets.requests.count('append') == 3
+
+
+def test_offline_scores_are_pushed_later(tmp_path, sheets):
+    sheets.failures = 100
+    reader: GoogleSheetsReader = make_reader(tmp_path, sheets)
+    scores: Scores = Scores(reader)
+    scores.update(score=5, username='b', timestamp='t')
+    scores.rewrite()
+    reader.close()
+    assert sheets.rows == []
+    assert (tmp_path / 'scores_outbox.csv').exists()
+
+    sheets.failures = 0
+    sheets.rows = [['1', 'other', 't']]
+    reader = make_reader(tmp_path, sheets)
+    scores = Scores(reader)
+    reader.close()
+    assert sheets.rows == [['1', 'other', 't'], ['5', 'b', 't']]
+    assert scores.scores_table.get_scores() == [
+        (1, 'other', 't'), (5, 'b', 't'),
+    ]
+    assert not (tmp_path / 'scores_outbox.csv').exists()
@@ -0,0 +1,36 @@
+import pygame
+import pytest
+
+from images.text_cache import TextRenderCache
+
+
+@pytest.fixture(scope='function')
+def font():
+    pygame.font.init()
+    yield pygame.font.Font(None, 36)
+
+
+def test_render_is_cached(font):
+    cache: TextRenderCache = TextRenderCache(max_size=4)
+    first = cache.render(font, 'Скорость: 1', True, (0, 0, 0), (255, 255, 255))
+    second = cache.render(font, 'Скорость: 1', True, (0, 0, 0), (255, 255, 255))
+
+    assert first is second
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    other_color = cache.render(font, 'Скорость: 1', True, (255, 0, 0))
+    assert other_color is not first
+    assert cache.misses == 2
+
+
+def test_bounded_eviction(font):
+    cache: TextRenderCache = TextRenderCache(max_size=2)
+    first = cache.render(font, 'a', True, (0, 0, 0))
+    cache.render(font, 'b', True, (0, 0, 0))
+    cache.render(font, 'a', True, (0, 0, 0))  # 'a' is the most recent now
+    cache.render(font, 'c', True, (0, 0, 0))
+
+    assert len(cache) == 2
+    assert cache.render(font, 'a', True, (0, 0, 0)) is first
+    cache.render(font, 'b', True, (0, 0, 0))
+    assert cache.misses == 4
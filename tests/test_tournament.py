@@ -0,0 +1,36 @@
+import random
+
+from tournament import new_bot_rng, play_game, run_tournament, summarize
+
+
+def test_play_game_is_reproducible():
+    first = play_game(seed=7, max_ticks=5000)
+    second = play_game(seed=7, max_ticks=5000)
+    first.pop('duration')
+    second.pop('duration')
+    assert first == second
+
+
+def test_tick_limit():
+    result = play_game(seed=1, max_ticks=10)
+    assert result['ticks'] == 10
+    assert result['game_over_reason'] == 'tick_limit'
+
+
+def test_run_tournament():
+    results = list(
+        run_tournament(games=7, workers=2, chunk_size=3, max_ticks=2000),
+    )
+    assert sorted(result['seed'] for result in results) == list(range(7))
+
+    summary = summarize(results, elapsed=1.0)
+    assert summary['games'] == 7
+    assert sum(summary['game_over_reasons'].values()) == 7
+
+
+def test_bot_does_not_share_the_figures_stream():
+    bot_rng: random.Random = new_bot_rng(7)
+    figures_rng: random.Random = random.Random(7)
+    assert [bot_rng.random() for _ in range(3)] != [
+        figures_rng.random() for _ in range(3)
+    ]
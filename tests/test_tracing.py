@@ -0,0 +1,48 @@
+import logging
+
+from game_core import Action, GameCore
+from tracing import TraceRing, trace
+
+
+def test_ring_keeps_last_events():
+    ring: TraceRing = TraceRing(size=3)
+    for tick in range(5):
+        ring.record('tick', tick)
+
+    assert len(ring) == 3
+    assert [args for _, _, args in ring.events] == [(2,), (3,), (4,)]
+
+
+def test_dump_formats_lazily(caplog):
+    class Lazy:
+        formatted: int = 0
+
+        def __str__(self) -> str:
+            Lazy.formatted += 1
+            return 'lazy'
+
+    ring: TraceRing = TraceRing(size=4)
+    ring.record('event', Lazy())
+    assert Lazy.formatted == 0
+
+    target: logging.Logger = logging.getLogger('test_tracing')
+    with caplog.at_level(logging.WARNING, logger='test_tracing'):
+        ring.dump(target, logging.INFO)
+        assert Lazy.formatted == 0
+        ring.dump(target)
+    assert Lazy.formatted == 1
+    assert 'event lazy' in caplog.text
+
+
+def test_core_records_game_events():
+    trace.clear()
+    core: GameCore = GameCore(seed=0)
+    core.step(Action.LEFT)
+    for _ in range(1000):
+        if core.step(Action.TICK).figure_locked:
+            break
+
+    events = [event for _, event, _ in trace.events]
+    assert events[0] == 'spawn'
+    assert 'action' in events
+    assert 'lock' in events
@@ -0,0 +1,43 @@
+import pygame
+
+from viewport import Viewport
+
+
+def test_cell_size_fits_the_field():
+    viewport: Viewport = Viewport(20, 10, size=(200, 400))
+    assert viewport.cell_size == 20
+    assert (viewport.rows, viewport.columns) == (20, 10)
+    assert viewport.pixel_size == (200, 400)
+    assert not viewport.follow(3, 18, 2, 2)
+
+
+def test_big_field_scrolls_to_the_figure():
+    viewport: Viewport = Viewport(
+        1000, 500, size=(200, 400), min_cell_size=4,
+    )
+    assert viewport.cell_size == 4
+    assert (viewport.rows, viewport.columns) == (100, 50)
+    assert viewport.cell_rect(0, 0) == pygame.Rect(0, 0, 4, 4)
+
+    assert viewport.follow(300, 600, 2, 2)
+    assert (viewport.first_row, viewport.first_column) == (551, 276)
+    assert viewport.cell_rect(0, 0) is None
+    assert viewport.cell_rect(300, 600) == pygame.Rect(96, 196, 4, 4)
+    # small moves inside the view do not scroll
+    assert not viewport.follow(301, 601, 2, 2)
+
+    # the view stays inside the field
+    assert viewport.follow(499, 999, 1, 1)
+    assert (viewport.first_row, viewport.first_column) == (900, 450)
+
+
+def test_zoom():
+    viewport: Viewport = Viewport(
+        20, 10, size=(200, 400), min_cell_size=4, max_cell_size=40,
+    )
+    assert viewport.zoom(10)
+    assert viewport.cell_size == 30
+    assert (viewport.rows, viewport.columns) == (13, 6)
+    assert viewport.zoom(-100)
+    assert viewport.cell_size == 4
+    assert not viewport.zoom(-1)
@@ -0,0 +1,170 @@
+import argparse
+import json
+import logging
+import os
+import random
+import signal
+import statistics
+import time
+from collections import Counter
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ProcessPoolExecutor,
+    wait,
+)
+from typing import Dict, Iterator, List, Optional, Set
+
+from game_core import Action, GameCore, GameState
+
+logger = logging.getLogger(__name__)
+
+GAME_OVER_TICK_LIMIT = 'tick_limit'
+
+# actions of the self-play bot, TICK means "do nothing this frame"
+BOT_ACTIONS = (
+    Action.TICK,
+    Action.LEFT,
+    Action.RIGHT,
+    Action.ROTATE,
+    Action.SOFT_DROP,
+)
+
+
+def new_bot_rng(seed: int) -> random.Random:
+    # a stream of its own: seeded like the figures, the bot's choices would
+    # follow the figure and column draws one for one
+    return random.Random(f'bot-{seed}')
+
+
+def play_game(seed: int, max_ticks: int) -> Dict:
+    started: float = time.perf_counter()
+    core: GameCore = GameCore(seed=seed)
+    bot_rng: random.Random = new_bot_rng(seed)
+    state: GameState = core.step(Action.TICK)
+    while not state.game_over and state.ticks < max_ticks:
+        action: Action = bot_rng.choice(BOT_ACTIONS)
+        if action != Action.TICK:
+            core.step(action)
+        state = core.step(Action.TICK)
+    return {
+        'seed': seed,
+        'score': state.points,
+        'lines': state.points,
+        'pieces': state.pieces,
+        'ticks': state.ticks,
+        'speed_level': state.speed_level,
+        'duration': time.perf_counter() - started,
+        'game_over_reason': state.game_over_reason or GAME_OVER_TICK_LIMIT,
+    }
+
+
+def play_games(seeds: List[int], max_ticks: int) -> List[Dict]:
+    return [play_game(seed, max_ticks) for seed in seeds]
+
+
+def ignore_sigint():
+    # Ctrl+C is handled by the parent, workers finish their current chunk
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def run_tournament(
+        games: int,
+        workers: Optional[int] = None,
+        chunk_size: int = 100,
+        base_seed: int = 0,
+        max_ticks: int = 100000,
+) -> Iterator[Dict]:
+    workers = workers or os.cpu_count() or 1
+    # at most two chunks per worker are queued, so huge sweeps do not
+    # create all futures upfront and cancellation stays cheap
+    max_in_flight: int = workers * 2
+    next_game: int = 0
+    in_flight: Set[Future] = set()
+    executor = ProcessPoolExecutor(
+        max_workers=workers, initializer=ignore_sigint,
+    )
+    try:
+        while next_game < games or in_flight:
+            while next_game < games and len(in_flight) < max_in_flight:
+                seeds: List[int] = list(
+                    range(
+                        base_seed + next_game,
+                        base_seed + min(next_game + chunk_size, games),
+                    ),
+                )
+                in_flight.add(executor.submit(play_games, seeds, max_ticks))
+                next_game += len(seeds)
+            done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield from future.result()
+    finally:
+        for future in in_flight:
+            future.cancel()
+        executor.shutdown(wait=True)
+
+
+def summarize(results: List[Dict], elapsed: float) -> Dict:
+    if not results:
+        return {'games': 0}
+    scores: List[int] = [result['score'] for result in results]
+    return {
+        'games': len(results),
+        'elapsed': elapsed,
+        'games_per_second': len(results) / elapsed if elapsed else 0.0,
+        'score_mean': statistics.mean(scores),
+        'score_median': statistics.median(scores),
+        'score_stdev': statistics.pstdev(scores),
+        'score_max': max(scores),
+        'lines_total': sum(result['lines'] for result in results),
+        'pieces_mean': statistics.mean(r['pieces'] for r in results),
+        'ticks_mean': statistics.mean(r['ticks'] for r in results),
+        'duration_mean': statistics.mean(r['duration'] for r in results),
+        'game_over_reasons': dict(
+            Counter(result['game_over_reason'] for result in results),
+        ),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Run headless self-play games on all cores',
+    )
+    parser.add_argument('--games', type=int, default=1000)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--chunk-size', type=int, default=100)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--max-ticks', type=int, default=100000)
+    parser.add_argument(
+        '--output', default=None, help='write per-game results as JSON lines',
+    )
+    args = parser.parse_args()
+
+    results: List[Dict] = []
+    output = open(args.output, 'w') if args.output else None
+    started: float = time.perf_counter()
+    try:
+        for result in run_tournament(
+                games=args.games,
+                workers=args.workers,
+                chunk_size=args.chunk_size,
+                base_seed=args.seed,
+                max_ticks=args.max_ticks,
+        ):
+            results.append(result)
+            if output:
+                output.write(json.dumps(result) + '\n')
+            if len(results) % args.chunk_size == 0:
+                print(f'{len(results)}/{args.games} games finished')
+    except KeyboardInterrupt:
+        print('Interrupted, summary of finished games:')
+    finally:
+        if output:
+            output.close()
+
+    summary: Dict = summarize(results, time.perf_counter() - started)
+    print(json.dumps(summary, indent=4))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+import logging
+import time
+from collections import deque
+from logging.handlers import QueueHandler, QueueListener
+from queue import Queue
+from typing import Deque, Tuple
+
+from settings import TRACE_RING_SIZE
+
+logger = logging.getLogger(__name__)
+
+LOG_FORMAT = (
+    '%(asctime)s - %(levelname)s - %(filename)s.%(funcName)s: %(message)s'
+)
+
+
+class TraceRing:
+    # fixed-size buffer of recent game events; record() only stores the raw
+    # arguments, they are formatted when the buffer is dumped
+    def __init__(self, size: int = TRACE_RING_SIZE):
+        self.events: Deque[Tuple[float, str, Tuple]] = deque(maxlen=size)
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+    def record(self, event: str, *args):
+        self.events.append((time.perf_counter(), event, args))
+
+    def clear(self):
+        self.events.clear()
+
+    def dump(self, target: logging.Logger, level: int = logging.ERROR):
+        if not self.events or not target.isEnabledFor(level):
+            return
+        first_timestamp: float = self.events[0][0]
+        target.log(level, 'Last %d game events:', len(self.events))
+        for timestamp, event, args in self.events:
+            target.log(
+                level,
+                '%10.4f %s %s',
+                timestamp - first_timestamp,
+                event,
+                ' '.join(str(arg) for arg in args),
+            )
+
+
+trace: TraceRing = TraceRing()
+
+
+def setup_logging(filename: str, level: int) -> QueueListener:
+    # the game thread only puts records into a queue, the file is written
+    # by the listener thread, so disk I/O never stalls a frame
+    log_queue: Queue = Queue(-1)
+    file_handler: logging.FileHandler = logging.FileHandler(filename)
+    file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    listener: QueueListener = QueueListener(log_queue, file_handler)
+
+    root_logger: logging.Logger = logging.getLogger()
+    root_logger.setLevel(level)
+    root_logger.addHandler(QueueHandler(log_queue))
+    listener.start()
+    return listener
@@ -0,0 +1,58 @@
+import os
+from typing import Iterator, List, Optional, Tuple
+
+import pygame
+
+from images.asset_pack import ASSET_PACK_PATH, asset_key, write_pack
+from images.clock import CLOCK_FRAME_SIZE
+from settings import DATA_FOLDER, MAIN_DIR, SCREEN_RESOLUTION
+
+# Bakes every image the game loads into one pack of pre-scaled raw pixels.
+# Run from the repository root after changing anything in data/:
+#     python -m utils.build_asset_pack
+
+
+def list_dir(name: str) -> List[str]:
+    path: str = os.path.join(MAIN_DIR, DATA_FOLDER, name)
+    return sorted(
+        f'{name}/{file}'
+        for file in os.listdir(path)
+        if os.path.isfile(os.path.join(path, file))
+    )
+
+
+def game_assets() -> List[Tuple[str, Optional[Tuple[int, int]]]]:
+    return (
+        [(file, SCREEN_RESOLUTION) for file in list_dir('bottle')]
+        + [(file, None) for file in list_dir('digits')]
+        + [
+            ('frame.png', CLOCK_FRAME_SIZE),
+            ('obstacle.bmp', None),
+            ('point.png', None),
+        ]
+    )
+
+
+def load_assets(
+        assets: List[Tuple[str, Optional[Tuple[int, int]]]],
+) -> Iterator[Tuple[str, pygame.Surface]]:
+    for name, size in assets:
+        print(f'packing {name} {size or ""}')
+        surface: pygame.Surface = pygame.image.load(
+            os.path.join(MAIN_DIR, DATA_FOLDER, name),
+        )
+        if size is not None:
+            surface = pygame.transform.scale(surface, size)
+        yield asset_key(name, size), surface
+
+
+def main():
+    if os.path.exists(ASSET_PACK_PATH):
+        # the running game may still map the old pack
+        os.remove(ASSET_PACK_PATH)
+    write_pack(ASSET_PACK_PATH, load_assets(game_assets()))
+    print(f'{ASSET_PACK_PATH}: {os.path.getsize(ASSET_PACK_PATH)} bytes')
+
+
+if __name__ == '__main__':
+    main()
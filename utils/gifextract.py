@@ -1,68 +1,147 @@
+import argparse
 import os
-from typing import Union, Dict
-from PIL import Image
+import time
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ProcessPoolExecutor,
+    wait,
+)
+from typing import Iterator, List, Optional, Set, Tuple, Union
 
-main_dir: Union[str, bytes] = os.path.split(os.path.abspath(__file__))[0]
+import pygame
+from PIL import Image, ImageSequence
 
+from settings import SCREEN_RESOLUTION
 
-def analyse_image(path) -> Dict:
-    im = Image.open(path)
-    results = {'size': im.size, 'mode': 'full'}
-    try:
-        while True:
-            if im.tile:
-                tile = im.tile[0]
-                update_region = tile[1]
-                update_region_dimensions = update_region[2:]
-                if update_region_dimensions != im.size:
-                    results['mode'] = 'partial'
-                    break
-            im.seek(im.tell() + 1)
-    except EOFError:
-        pass
-    return results
-
-
-def process_image(source_path: str, dest_folder: str):
-    mode = analyse_image(source_path)['mode']
-    im = Image.open(source_path)
+# Run from the repository root:
+#     python -m utils.gifextract [source.gif dest_folder] [--scale]
 
-    image_counter = 0
-    palette = im.getpalette()
-    last_frame = im.convert('RGBA')
-
-    try:
-        while True:
-            print(
-                f'saving {source_path} ({mode}) frame {image_counter}, {im.size} {im.tile}',
-            )
-
-            if not im.getpalette():
-                im.putpalette(palette)
+main_dir: Union[str, bytes] = os.path.split(os.path.abspath(__file__))[0]
 
-            new_frame = Image.new('RGBA', im.size)
+# GIF disposal methods; 0 and 1 keep the frame under the next one
+DISPOSE_TO_BACKGROUND = 2
+DISPOSE_TO_PREVIOUS = 3
 
-            if mode == 'partial':
-                new_frame.paste(last_frame)
 
-            new_frame.paste(im, (0, 0), im.convert('RGBA'))
-            file_name_root: str = ''.join(
-                os.path.basename(source_path).split('.')[:-1],
+def iter_frames(
+        source_path: str, size: Optional[Tuple[int, int]] = None,
+) -> Iterator[Image.Image]:
+    # single decoding pass; every frame is composited over what the
+    # disposal method of the previous frame left, so frames that only
+    # update a part of the image come out complete
+    im = Image.open(source_path)
+    palette = im.getpalette()
+    canvas = Image.new('RGBA', im.size)
+
+    for frame in ImageSequence.Iterator(im):
+        if frame.mode == 'P' and not frame.getpalette():
+            frame.putpalette(palette)
+        rgba_frame = frame.convert('RGBA')
+        new_frame = canvas.copy()
+        new_frame.paste(rgba_frame, (0, 0), rgba_frame)
+
+        disposal: int = getattr(frame, 'disposal_method', 0)
+        if disposal == DISPOSE_TO_BACKGROUND:
+            # the area of the frame is cleared before the next one
+            canvas = new_frame.copy()
+            canvas.paste(
+                (0, 0, 0, 0),
+                getattr(frame, 'dispose_extent', (0, 0, *im.size)),
             )
+        elif disposal != DISPOSE_TO_PREVIOUS:
+            canvas = new_frame
+        if size is not None and new_frame.size != size:
+            # nearest neighbour, like pygame.transform.scale at runtime
+            yield new_frame.resize(size, Image.NEAREST)
+        else:
+            yield new_frame
+
+
+def save_frame(frame: Image.Image, path: str) -> str:
+    frame.save(path, 'PNG')
+    return path
+
+
+def process_image(
+        source_path: str,
+        dest_folder: str,
+        size: Optional[Tuple[int, int]] = None,
+        workers: Optional[int] = None,
+) -> int:
+    workers = workers or os.cpu_count() or 1
+    # PNG encoding is the slow part: frames are decoded here and encoded in
+    # worker processes, with a bounded number of frames waiting in the queue
+    max_in_flight: int = workers * 2
+    file_name_root: str = ''.join(
+        os.path.basename(source_path).split('.')[:-1],
+    )
+    frames_count: int = 0
+    in_flight: Set[Future] = set()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for image_counter, frame in enumerate(iter_frames(source_path, size)):
+            if len(in_flight) >= max_in_flight:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    future.result()
             file_name: str = f'{file_name_root}-{image_counter}.png'
-            new_frame.save(os.path.join(dest_folder, file_name), 'PNG')
-
-            image_counter += 1
-            last_frame = new_frame
-            im.seek(im.tell() + 1)
-    except EOFError:
-        pass
+            in_flight.add(
+                executor.submit(
+                    save_frame, frame, os.path.join(dest_folder, file_name),
+                ),
+            )
+            frames_count += 1
+        for future in in_flight:
+            future.result()
+    return frames_count
+
+
+def load_frames(
+        source_path: str, size: Optional[Tuple[int, int]] = None,
+) -> List[pygame.Surface]:
+    # in-memory extraction for Background, no PNGs are written; RGB keeps
+    # the frames a quarter smaller than RGBA
+    frames: List[pygame.Surface] = []
+    for frame in iter_frames(source_path, size):
+        rgb_frame = frame.convert('RGB')
+        frames.append(
+            pygame.image.frombuffer(rgb_frame.tobytes(), rgb_frame.size, 'RGB'),
+        )
+    return frames
 
 
 def main():
-    process_image(
-        os.path.join(main_dir, '../data', 'background.gif'),
-        os.path.join(main_dir, '../data', 'bottle'),
+    parser = argparse.ArgumentParser(
+        description='Extract GIF animation frames to PNG files',
+    )
+    parser.add_argument(
+        'source',
+        nargs='?',
+        default=os.path.join(main_dir, '../data', 'background.gif'),
+    )
+    parser.add_argument(
+        'dest_folder',
+        nargs='?',
+        default=os.path.join(main_dir, '../data', 'bottle'),
+    )
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument(
+        '--scale',
+        action='store_true',
+        help=f'pre-scale frames to {SCREEN_RESOLUTION[0]}x{SCREEN_RESOLUTION[1]}',
+    )
+    args = parser.parse_args()
+
+    started: float = time.perf_counter()
+    frames_count: int = process_image(
+        args.source,
+        args.dest_folder,
+        size=SCREEN_RESOLUTION if args.scale else None,
+        workers=args.workers,
+    )
+    print(
+        f'saved {frames_count} frames of {args.source} to {args.dest_folder}'
+        f' in {time.perf_counter() - started:.2f}s',
     )
 
 
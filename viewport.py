@@ -0,0 +1,96 @@
+from typing import Optional, Tuple
+
+import pygame
+
+from settings import FIELD_VIEWPORT_SIZE, MAX_CELL_SIZE, MIN_CELL_SIZE
+
+
+class Viewport:
+    # maps field cells to screen pixels. The cell size is the largest one
+    # showing the whole field, but not less than min_cell_size; bigger
+    # fields are scrolled to keep the current figure in view.
+    def __init__(
+            self,
+            field_v_size: int,
+            field_h_size: int,
+            size: Tuple[int, int] = FIELD_VIEWPORT_SIZE,
+            min_cell_size: int = MIN_CELL_SIZE,
+            max_cell_size: int = MAX_CELL_SIZE,
+    ):
+        self.field_v_size: int = field_v_size
+        self.field_h_size: int = field_h_size
+        self.width, self.height = size
+        self.min_cell_size: int = min_cell_size
+        self.max_cell_size: int = max_cell_size
+        self.first_row: int = 0
+        self.first_column: int = 0
+        self.set_cell_size(
+            min(self.width // field_h_size, self.height // field_v_size),
+        )
+
+    @property
+    def pixel_size(self) -> Tuple[int, int]:
+        return self.columns * self.cell_size, self.rows * self.cell_size
+
+    @property
+    def column_mask(self) -> int:
+        # bits of the visible columns in a row shifted by first_column
+        return (1 << self.columns) - 1
+
+    def set_cell_size(self, cell_size: int):
+        self.cell_size: int = max(
+            self.min_cell_size, min(cell_size, self.max_cell_size),
+        )
+        self.rows: int = min(self.field_v_size, self.height // self.cell_size)
+        self.columns: int = min(
+            self.field_h_size, self.width // self.cell_size,
+        )
+        self.first_row = min(self.first_row, self.field_v_size - self.rows)
+        self.first_column = min(
+            self.first_column, self.field_h_size - self.columns,
+        )
+
+    def zoom(self, step: int) -> bool:
+        cell_size: int = self.cell_size
+        self.set_cell_size(cell_size + step)
+        return self.cell_size != cell_size
+
+    def follow(self, pos_x: int, pos_y: int, x_size: int, y_size: int) -> bool:
+        # scrolls by a jump when the area leaves the view, so a falling
+        # figure does not make every frame a full redraw; True if scrolled
+        first_row: int = self.__scroll(
+            self.first_row, self.rows, self.field_v_size, pos_y, y_size,
+        )
+        first_column: int = self.__scroll(
+            self.first_column, self.columns, self.field_h_size, pos_x, x_size,
+        )
+        scrolled: bool = (first_row, first_column) != (
+            self.first_row, self.first_column,
+        )
+        self.first_row, self.first_column = first_row, first_column
+        return scrolled
+
+    def cell_rect(self, x: int, y: int) -> Optional[pygame.Rect]:
+        # None for cells out of view
+        column: int = x - self.first_column
+        row: int = y - self.first_row
+        if not (0 <= column < self.columns and 0 <= row < self.rows):
+            return None
+        return pygame.Rect(
+            column * self.cell_size,
+            row * self.cell_size,
+            self.cell_size,
+            self.cell_size,
+        )
+
+    @staticmethod
+    def __scroll(
+            first: int, visible: int, total: int, position: int, size: int,
+    ) -> int:
+        if visible >= total:
+            return 0
+        if position >= first and position + size <= first + visible:
+            return first
+        # the area is centered in the view after the jump
+        first = position + size // 2 - visible // 2
+        return max(0, min(first, total - visible))